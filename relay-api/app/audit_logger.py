@@ -3,7 +3,8 @@ from typing import List, Optional
 from datetime import datetime
 import json
 import os
-from supabase import create_client, Client
+
+from .supabase_client import insert, query
 
 logger = logging.getLogger(__name__)
 
@@ -11,14 +12,11 @@ class SanctionsAuditLogger:
     def __init__(self):
         self.supabase_url = os.getenv("SUPABASE_URL")
         self.supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-        self.supabase: Optional[Client] = None
+        # Database writes go through the shared async PostgREST client
+        self.db_enabled = bool(self.supabase_url and self.supabase_key)
         
-        if self.supabase_url and self.supabase_key:
-            try:
-                self.supabase = create_client(self.supabase_url, self.supabase_key)
-                logger.info("Supabase client initialized for audit logging")
-            except Exception as e:
-                logger.error(f"Failed to initialize Supabase client: {e}")
+        if self.db_enabled:
+            logger.info("Supabase audit logging enabled")
         else:
             logger.warning("Supabase credentials not found, audit logging will be file-based only")
         
@@ -70,14 +68,14 @@ class SanctionsAuditLogger:
     
     async def _log_to_database(self, audit_entry: dict) -> bool:
         """Log audit entry to Supabase database"""
-        if not self.supabase:
+        if not self.db_enabled:
             return False
         
         try:
             # Try to insert into sanctions_audit_log table
-            response = self.supabase.table("sanctions_audit_log").insert(audit_entry).execute()
+            rows = await insert("sanctions_audit_log", audit_entry, returning=True)
             
-            if response.data:
+            if rows:
                 logger.debug(f"Audit entry logged to database: {audit_entry['action']} on {audit_entry['address']}")
                 return True
             else:
@@ -149,26 +147,28 @@ class SanctionsAuditLogger:
         logs = []
         
         # Try to get from database first
-        if self.supabase:
+        if self.db_enabled:
             try:
-                query = self.supabase.table("sanctions_audit_log").select("*")
-                
+                eq = {}
                 if partner_id:
-                    query = query.eq("partner_id", partner_id)
+                    eq["partner_id"] = partner_id
                 if action:
-                    query = query.eq("action", action)
+                    eq["action"] = action
                 if address:
-                    query = query.eq("address", address.lower())
+                    eq["address"] = address.lower()
+                filters = []
                 if start_date:
-                    query = query.gte("timestamp", start_date)
+                    filters.append(("timestamp", f"gte.{start_date}"))
                 if end_date:
-                    query = query.lte("timestamp", end_date)
+                    filters.append(("timestamp", f"lte.{end_date}"))
                 
-                query = query.order("timestamp", desc=True).limit(limit)
-                response = query.execute()
+                rows = await query(
+                    "sanctions_audit_log", eq=eq, filters=filters,
+                    order="timestamp.desc", limit=limit,
+                )
                 
-                if response.data:
-                    logs.extend(response.data)
+                if rows:
+                    logs.extend(rows)
                     
             except Exception as e:
                 logger.error(f"Failed to retrieve audit logs from database: {e}")
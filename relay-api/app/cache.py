@@ -0,0 +1,54 @@
+"""
+Small in-process TTL + LRU cache used to keep Supabase lookups off the hot path
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+	"""Bounded mapping whose entries expire `ttl` seconds after being written.
+
+	Least-recently-used entries are evicted once `maxsize` is reached. Not
+	thread-safe: meant to be used from the event loop only.
+	"""
+
+	def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self._timer = timer
+		self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+	def get(self, key: Hashable, default: Any = None) -> Any:
+		item = self._data.get(key)
+		if item is None:
+			return default
+		expires_at, value = item
+		if expires_at <= self._timer():
+			del self._data[key]
+			return default
+		self._data.move_to_end(key)
+		return value
+
+	def __setitem__(self, key: Hashable, value: Any) -> None:
+		self._data[key] = (self._timer() + self.ttl, value)
+		self._data.move_to_end(key)
+		while len(self._data) > self.maxsize:
+			self._data.popitem(last=False)
+
+	def __contains__(self, key: Hashable) -> bool:
+		return self.get(key, _MISSING) is not _MISSING
+
+	def __len__(self) -> int:
+		return len(self._data)
+
+	def pop(self, key: Hashable, default: Any = None) -> Any:
+		item = self._data.pop(key, None)
+		return default if item is None else item[1]
+
+	def clear(self) -> None:
+		self._data.clear()
+
+
+_MISSING = object()
@@ -3,14 +3,20 @@ Local sanctions checker that reads from a JSON file instead of querying Supabase
 """
 
 import json
+import logging
 import os
+import time
 from pathlib import Path
-from typing import Set, Optional
+from typing import Callable, List, Set, Optional
 
+logger = logging.getLogger(__name__)
 
 class LocalSanctionsChecker:
     """Local sanctions checker using JSON file instead of database queries"""
     
+    # Minimum seconds between file mtime checks on the lookup path
+    RELOAD_CHECK_INTERVAL = 1.0
+    
     def __init__(self, file_path: Optional[str] = None):
         """Initialize with path to sanctioned wallets JSON file"""
         if file_path is None:
@@ -21,14 +27,26 @@ class LocalSanctionsChecker:
         self.file_path = Path(file_path)
         self._sanctioned_addresses: Set[str] = set()
         self._last_modified = 0
+        self._next_reload_check = 0.0
+        self._listeners: List[Callable[[], None]] = []
         self._load_sanctioned_addresses()
     
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Register a callback invoked whenever the sanctioned set changes (e.g. to purge caches)"""
+        self._listeners.append(callback)
+    
+    def _notify(self) -> None:
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error("Error in sanctions change listener: %s", e)
+    
     def _load_sanctioned_addresses(self) -> None:
         """Load sanctioned addresses from JSON file"""
         try:
             if not self.file_path.exists():
-                print(f"⚠️  Warning: Sanctioned wallets file not found at {self.file_path}")
-                print("   Creating empty sanctioned wallets list")
+                logger.warning("Sanctioned wallets file not found at %s, creating default list", self.file_path)
                 self._create_default_file()
                 return
             
@@ -44,11 +62,12 @@ class LocalSanctionsChecker:
             addresses = data.get('sanctioned_addresses', [])
             self._sanctioned_addresses = {addr.lower() for addr in addresses if addr}
             self._last_modified = current_mtime
+            self._notify()
             
-            print(f"✅ Loaded {len(self._sanctioned_addresses)} sanctioned addresses from {self.file_path}")
+            logger.info("Loaded %d sanctioned addresses from %s", len(self._sanctioned_addresses), self.file_path)
             
         except Exception as e:
-            print(f"❌ Error loading sanctioned wallets: {e}")
+            logger.error("Error loading sanctioned wallets: %s", e)
             self._sanctioned_addresses = set()
     
     def _create_default_file(self) -> None:
@@ -70,28 +89,36 @@ class LocalSanctionsChecker:
             
             self._sanctioned_addresses = {addr.lower() for addr in default_data["sanctioned_addresses"]}
             self._last_modified = self.file_path.stat().st_mtime
+            self._notify()
             
-            print(f"✅ Created default sanctioned wallets file at {self.file_path}")
+            logger.info("Created default sanctioned wallets file at %s", self.file_path)
             
         except Exception as e:
-            print(f"❌ Error creating default file: {e}")
+            logger.error("Error creating default sanctioned wallets file: %s", e)
+    
+    def maybe_reload(self) -> None:
+        """Reload the file if it has been modified (stat at most once per RELOAD_CHECK_INTERVAL).
+        
+        Subscribers are notified when the set changes, so callers that cache
+        lookups should call this before reading their cache.
+        """
+        now = time.monotonic()
+        if now >= self._next_reload_check:
+            self._next_reload_check = now + self.RELOAD_CHECK_INTERVAL
+            self._load_sanctioned_addresses()
     
     def is_sanctioned(self, address: str) -> bool:
         """Check if an address is sanctioned"""
         if not address:
             return False
         
-        # Reload file if it has been modified
-        self._load_sanctioned_addresses()
+        self.maybe_reload()
         
         # Normalize address and check
-        normalized_addr = address.lower()
-        is_sanctioned = normalized_addr in self._sanctioned_addresses
+        is_sanctioned = address.lower() in self._sanctioned_addresses
         
         if is_sanctioned:
-            print(f"🚫 SANCTIONED WALLET DETECTED: {address}")
-        else:
-            print(f"✅ Wallet {address} is clean (not sanctioned)")
+            logger.warning("Sanctioned wallet detected: %s", address)
         
         return is_sanctioned
     
@@ -131,13 +158,14 @@ class LocalSanctionsChecker:
                     json.dump(data, f, indent=2)
                 
                 self._last_modified = self.file_path.stat().st_mtime
-                print(f"✅ Added sanctioned address: {address}")
+                self._notify()
+                logger.info("Added sanctioned address: %s", address)
                 return True
             
             return False
             
         except Exception as e:
-            print(f"❌ Error adding sanctioned address: {e}")
+            logger.error("Error adding sanctioned address: %s", e)
             return False
 
     def remove_sanctioned_address(self, address: str) -> bool:
@@ -167,13 +195,14 @@ class LocalSanctionsChecker:
                     json.dump(data, f, indent=2)
                 
                 self._last_modified = self.file_path.stat().st_mtime
-                print(f"✅ Removed sanctioned address: {address}")
+                self._notify()
+                logger.info("Removed sanctioned address: %s", address)
                 return True
             
             return False
             
         except Exception as e:
-            print(f"❌ Error removing sanctioned address: {e}")
+            logger.error("Error removing sanctioned address: %s", e)
             return False
 
 
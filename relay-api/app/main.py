@@ -1,22 +1,37 @@
 
 import os
+import re
+import atexit
+import hmac
+import hashlib
+import asyncio
 import logging
+import queue
 import httpx
-from typing import Optional, Dict, List, Any, Tuple
+import orjson
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from types import MappingProxyType
+from typing import Optional, Dict, List, Any, Mapping, Tuple
 
 from fastapi import FastAPI, Header, HTTPException, Depends, Security, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html, get_swagger_ui_oauth2_redirect_html
 from fastapi.openapi.utils import get_openapi
 from pydantic import BaseModel, Field, ConfigDict
-from web3 import Web3
+from eth_account import Account
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
 
-from .supabase_client import get_supabase
+from .cache import TTLCache
+from .supabase_client import close_rest_client, get_rest_client, query
+from .write_behind import ALL_QUEUES, relay_log_queue, relay_tx_log_queue
 from .local_sanctions import local_sanctions_checker
-from .tx_decode import extract_to_address, is_hex_string
-from .utils import Decision, decision_from, now_iso
-from .risk_model import FeatureHit, compute_risk_score, log_risk_events, upsert_risk_score
+from .tx_decode import decode_hex, decode_tx_fields
+from .utils import EVM_ADDR_RE, Decision, decision_from, now_iso, parse_iso_utc
+from .risk_model import FeatureHit, compute_risk_score, get_cached_risk, log_risk_events, upsert_risk_score
 from .wallet_risk_assessor import WalletRiskAssessor
 from .audit_logger import SanctionsAuditLogger
 from .confirmation_system import confirmation_system
@@ -34,21 +49,28 @@ class FeatureHitIn(BaseModel):
 	critical: Optional[bool] = False
 	details: Optional[dict[str, Any]] = None
 
-	model_config = ConfigDict(extra="ignore")
+	model_config = ConfigDict(extra="ignore", frozen=True)
 
 	def to_domain(self) -> FeatureHit:
 		# occurredAt expected as ISO 8601
-		from datetime import datetime
-		from datetime import timezone as tz
-		occurred_at = datetime.fromisoformat(self.occurredAt.replace("Z", "+00:00")).astimezone(tz.utc)
 		return FeatureHit(
 			key=self.key,
 			base=float(self.base),
-			occurred_at=occurred_at,
+			occurred_at=parse_iso_utc(self.occurredAt),
 			critical=bool(self.critical),
 			details=self.details or {},
 		)
 
+	@classmethod
+	def list_to_domain(cls, items: List["FeatureHitIn"]) -> List[FeatureHit]:
+		"""Batch form of to_domain with the constructor and parser bound to locals"""
+		hit = FeatureHit
+		parse = parse_iso_utc
+		return [
+			hit(key=f.key, base=float(f.base), occurred_at=parse(f.occurredAt), critical=bool(f.critical), details=f.details or {})
+			for f in items
+		]
+
 
 class CheckRequest(BaseModel):
 	chain: str = Field(default="ethereum")
@@ -61,6 +83,7 @@ class CheckRequest(BaseModel):
 	# Provide Swagger example so the UI is pre-filled with valid data
 	model_config = ConfigDict(
 		populate_by_name=True,
+		frozen=True,
 		json_schema_extra={
 			"example": {
 				"chain": "ethereum",
@@ -84,6 +107,7 @@ class RelayRequest(BaseModel):
 	user_geo: Optional[Dict[str, Any]] = Field(default=None, description="End-user geolocation data from client-side")
 
 	model_config = ConfigDict(
+		frozen=True,
 		json_schema_extra={
 			"example": {
 				"chain": "ethereum",
@@ -127,13 +151,22 @@ class SanctionedWalletResponse(BaseModel):
 	total_count: int
 
 
+class InvalidateKeyRequest(BaseModel):
+	api_key: str = Field(..., description="API key to drop from the in-process auth cache")
+
+
 ## (Removed auxiliary models for deleted endpoints)
 
 
 app = FastAPI(
     title="Relay API", 
     version="1.2.0",
-    openapi_tags=[{"name": "default", "description": "Relay API endpoints"}]
+    default_response_class=ORJSONResponse,
+    openapi_tags=[{"name": "default", "description": "Relay API endpoints"}],
+    # Schema and docs pages are served below from a schema serialized once
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None
 )
 
 # CORS for frontend
@@ -149,7 +182,6 @@ app.add_middleware(
 )
 
 # Configure OpenAPI security scheme for Swagger UI
-app.openapi_schema = None  # Force regeneration
 def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
@@ -175,13 +207,80 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+OPENAPI_URL = "/openapi.json"
+SWAGGER_OAUTH2_REDIRECT_URL = "/docs/oauth2-redirect"
+# root_path (proxy prefix) -> serialized schema; there is normally only one
+_openapi_bytes: Dict[str, bytes] = {}
+
+
+def _openapi_json(root_path: str = "") -> bytes:
+    cached = _openapi_bytes.get(root_path)
+    if cached is None:
+        schema = custom_openapi()
+        if root_path:
+            # As FastAPI does: let "Try it out" call through the proxy prefix
+            schema = {**schema, "servers": [{"url": root_path}, *schema.get("servers", [])]}
+        cached = _openapi_bytes[root_path] = orjson.dumps(schema)
+    return cached
+
+
+def _root_path(request: Request) -> str:
+    return request.scope.get("root_path", "").rstrip("/")
+
+
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_json(request: Request) -> Response:
+    return Response(content=_openapi_json(_root_path(request)), media_type="application/json")
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui(request: Request) -> HTMLResponse:
+    root_path = _root_path(request)
+    return get_swagger_ui_html(
+        openapi_url=root_path + OPENAPI_URL,
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url=root_path + SWAGGER_OAUTH2_REDIRECT_URL,
+    )
+
+
+@app.get(SWAGGER_OAUTH2_REDIRECT_URL, include_in_schema=False)
+async def swagger_ui_redirect() -> HTMLResponse:
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc(request: Request) -> HTMLResponse:
+    return get_redoc_html(openapi_url=_root_path(request) + OPENAPI_URL, title=f"{app.title} - ReDoc")
+
+
+# Configure logging: records are handed to a queue and written to stderr by a
+# listener thread, so handlers never block a request on stream I/O
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+_log_listener = QueueListener(_log_queue, _log_stream_handler)
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:
+	# Handler and listener go in together, so queued records are always drained
+	_root_logger.addHandler(QueueHandler(_log_queue))
+	_log_listener.start()
+	atexit.register(_log_listener.stop)  # flushes whatever is still queued
+_root_logger.setLevel(LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
 # Global instances
-w3_clients: Dict[str, Web3] = {}
+w3_clients: Dict[str, AsyncWeb3] = {}
+_rpc_session: Optional[ClientSession] = None
+_http_client: Optional[httpx.AsyncClient] = None
+RPC_TIMEOUT_SECONDS = 5
+_background_tasks: set[asyncio.Task] = set()
+# Validated API key -> (partner_id, webhook_key); only successful lookups are cached
+_api_key_cache = TTLCache(maxsize=10_000, ttl=float(os.getenv("API_KEY_CACHE_TTL_SECONDS", "60")))
+_api_key_inflight: Dict[str, asyncio.Task] = {}
+_API_KEY_RE = re.compile(r"[A-Za-z0-9_\-]+")
+# (chain, token address) -> (decimals, symbol) from ERC-20 eth_calls
+_token_meta_cache = TTLCache(maxsize=10_000, ttl=3600)
 wallet_risk_assessor = WalletRiskAssessor()
 audit_logger = SanctionsAuditLogger()
 
@@ -202,267 +301,265 @@ ERC20_MIN_ABI = [
 	},
 ]
 
+# chain alias -> canonical chain name
+_CHAIN_ALIASES: Mapping[str, str] = MappingProxyType({
+	"eth": "ethereum",
+	"ethereum": "ethereum",
+	"sepolia": "sepolia",
+	"matic": "polygon",
+	"polygon": "polygon",
+	"arb": "arbitrum",
+	"arbitrum": "arbitrum",
+	"optimism": "optimism",
+	"base": "base",
+	"bsc": "bsc",
+	"binance-smart-chain": "bsc",
+	"avax": "avalanche",
+	"avalanche": "avalanche",
+})
+
+# canonical chain name -> native currency symbol
+_NATIVE_CURRENCY: Mapping[str, str] = MappingProxyType({
+	"ethereum": "ETH",
+	"sepolia": "ETH",
+	"polygon": "MATIC",
+	"polygon-zkevm": "ETH",
+	"polygon_zkevm": "ETH",
+	"arbitrum": "ETH",
+	"optimism": "ETH",
+	"base": "ETH",
+	"bsc": "BNB",
+	"avalanche": "AVAX",
+	"fantom": "FTM",
+	"gnosis": "xDAI",
+	"celo": "CELO",
+	"moonbeam": "GLMR",
+	"aurora": "ETH",
+	"cronos": "CRO",
+	"mantle": "MNT",
+	"linea": "ETH",
+	"scroll": "ETH",
+	"immutable": "ETH",
+	"taiko": "ETH",
+	"zksync": "ETH",
+})
+
 def _normalize_chain_name(chain: str) -> str:
 	key = (chain or "").lower()
-	mapping = {
-		"eth": "ethereum",
-		"ethereum": "ethereum",
-		"sepolia": "sepolia",
-		"matic": "polygon",
-		"polygon": "polygon",
-		"arb": "arbitrum",
-		"arbitrum": "arbitrum",
-		"optimism": "optimism",
-		"base": "base",
-		"bsc": "bsc",
-		"binance-smart-chain": "bsc",
-		"avax": "avalanche",
-		"avalanche": "avalanche",
-	}
-	return mapping.get(key, key or "ethereum")
+	return _CHAIN_ALIASES.get(key, key or "ethereum")
 
-def _decode_native_and_token_amounts(raw_tx_hex: str, chain: str) -> tuple[Optional[float], Optional[str]]:
-	"""Best-effort decode of amount and currency from signed raw tx.
+async def _token_metadata(w3: AsyncWeb3, chain: str, token_addr: str) -> tuple[int, str]:
+	"""ERC-20 (decimals, symbol) for a token, cached: token metadata is effectively immutable.
+
+	Raises if decimals() cannot be read; a failed symbol() falls back to 'ERC20' and
+	is not cached, so a transient RPC error doesn't pin the placeholder for an hour.
+	"""
+	key = (chain, token_addr.lower())
+	cached = _token_meta_cache.get(key)
+	if cached is not None:
+		return cached
+	contract = w3.eth.contract(address=Web3.to_checksum_address(token_addr), abi=ERC20_MIN_ABI)
+	decimals, symbol = await asyncio.gather(
+		contract.functions.decimals().call(),
+		contract.functions.symbol().call(),
+		return_exceptions=True,
+	)
+	if isinstance(decimals, BaseException):
+		raise decimals
+	if isinstance(symbol, BaseException):
+		return int(decimals), "ERC20"
+	result = (int(decimals), symbol)
+	_token_meta_cache[key] = result
+	return result
+
+# ERC-20 selector -> index of the uint256 amount word in the calldata
+_ERC20_AMOUNT_WORD: Mapping[bytes, int] = MappingProxyType({
+	bytes.fromhex("a9059cbb"): 1,  # transfer(address,uint256)
+	bytes.fromhex("23b872dd"): 2,  # transferFrom(address,address,uint256)
+})
+
+async def _decode_native_and_token_amounts(tx: Dict[str, Any], chain: str) -> tuple[Optional[float], Optional[str]]:
+	"""Best-effort amount and currency from a decoded tx (see tx_decode.decode_tx_fields).
 
 	Returns (amount, currency). For native transfers currency will be chain native (e.g., ETH).
 	For ERC-20, currency will be token symbol if retrievable; otherwise 'ERC20'.
 	"""
-	amount: Optional[float] = None
+	amount: Optional[float] = float(Web3.from_wei(tx["value"], "ether"))
 	currency: Optional[str] = None
-	# 1) Try to decode tx (legacy first, then typed/EIP-1559) to get 'value' and 'data'
-	decoded = None
-	input_data = None
-	# Legacy decoder
-	try:
-		from eth_account._utils.legacy_transactions import decode_transaction as decode_legacy
-		decoded = decode_legacy(raw_tx_hex)
-	except Exception:
-		decoded = None
-	# Typed decoder fallback
-	if decoded is None:
+
+	# If input data is an ERC-20 transfer, read the amount and scale it by the token's decimals
+	data = tx["data"]
+	word = _ERC20_AMOUNT_WORD.get(data[:4])
+	if word is not None and len(data) >= 4 + 32 * (word + 1):
+		amount_int = int.from_bytes(data[4 + 32 * word : 4 + 32 * (word + 1)], "big")
 		try:
-			from eth_account._utils.typed_transactions import decode_transaction as decode_typed
-			decoded = decode_typed(raw_tx_hex)
+			# For a contract call, 'to' is the token address
+			token_addr = tx["to"]
+			if token_addr:
+				decimals, symbol = await _token_metadata(get_w3(chain), chain, token_addr)
+				if decimals >= 0:
+					amount = float(amount_int / (10 ** decimals))
+					currency = symbol or "ERC20"
 		except Exception:
-			decoded = None
-	# Extract input and value
-	try:
-		if decoded:
-			input_data = decoded.get("data") or decoded.get("input")
-			value_wei = decoded.get("value")
-			if value_wei is not None:
-				amount = float(Web3.from_wei(int(value_wei), "ether"))
-				# currency will be assigned below based on chain mapping if not ERC20
-	except Exception:
-		pass
-
-	# 2) If input data indicates ERC-20 transfer, parse and fetch token metadata
-	try:
-		if not input_data and isinstance(raw_tx_hex, str) and raw_tx_hex.startswith("0x"):
-			# For some decoders, legacy 'data' may not be filled; we cannot RLP here easily
-			pass
-		if input_data and isinstance(input_data, (bytes, bytearray)):
-			input_hex = Web3.to_hex(input_data)
-		elif isinstance(input_data, str):
-			input_hex = input_data
-		else:
-			input_hex = None
-		# Detect ERC-20 function selectors
-		if input_hex and input_hex.startswith("0x") and len(input_hex) >= 10:
-			selector = input_hex[:10]
-			# transfer(address,uint256)
-			if selector == "0xa9059cbb" and len(input_hex) >= 10 + 64 * 2:
-				amount_hex = input_hex[10 + 64 : 10 + 128]
-				amount_int = int(amount_hex, 16)
-				# Query token metadata from 'to' contract
-				try:
-					w3 = get_w3(chain)
-					# We need the contract address. For contract call, 'to' is the token address; if we failed earlier, leave symbol unknown
-					# Attempt to extract to address from raw tx using existing helper
-					token_addr = extract_to_address(raw_tx_hex)
-					if token_addr:
-						contract = w3.eth.contract(address=Web3.to_checksum_address(token_addr), abi=ERC20_MIN_ABI)
-						decimals = int(contract.functions.decimals().call())
-						try:
-							symbol = contract.functions.symbol().call()
-						except Exception:
-							symbol = "ERC20"
-						if decimals >= 0:
-							amount = float(amount_int / (10 ** decimals))
-							currency = symbol or "ERC20"
-				except Exception:
-					# Fallback if token metadata not retrievable
-					if amount_int > 0 and amount is None:
-						amount = float(amount_int)
-						currency = "ERC20"
-			# transferFrom(address,address,uint256)
-			elif selector == "0x23b872dd" and len(input_hex) >= 10 + 64 * 3:
-				amount_hex = input_hex[10 + 64 * 2 : 10 + 64 * 3]
-				amount_int = int(amount_hex, 16)
-				try:
-					w3 = get_w3(chain)
-					token_addr = extract_to_address(raw_tx_hex)
-					if token_addr:
-						contract = w3.eth.contract(address=Web3.to_checksum_address(token_addr), abi=ERC20_MIN_ABI)
-						decimals = int(contract.functions.decimals().call())
-						try:
-							symbol = contract.functions.symbol().call()
-						except Exception:
-							symbol = "ERC20"
-						if decimals >= 0:
-							amount = float(amount_int / (10 ** decimals))
-							currency = symbol or "ERC20"
-				except Exception:
-					if amount_int > 0 and amount is None:
-						amount = float(amount_int)
-						currency = "ERC20"
-	except Exception:
-		pass
+			# Token metadata not retrievable: report the raw token units, never the (zero) native value
+			amount = float(amount_int)
+			currency = "ERC20"
 
 	# Default currency label for known native chains if amount present and currency not set
 	if amount is not None and not currency:
-		native_by_chain = {
-			"ethereum": "ETH",
-			"sepolia": "ETH",
-			"polygon": "MATIC",
-			"polygon-zkevm": "ETH",
-			"polygon_zkevm": "ETH",
-			"arbitrum": "ETH",
-			"optimism": "ETH",
-			"base": "ETH",
-			"bsc": "BNB",
-			"avalanche": "AVAX",
-			"fantom": "FTM",
-			"gnosis": "xDAI",
-			"celo": "CELO",
-			"moonbeam": "GLMR",
-			"aurora": "ETH",
-			"cronos": "CRO",
-			"mantle": "MNT",
-			"linea": "ETH",
-			"scroll": "ETH",
-			"immutable": "ETH",
-			"taiko": "ETH",
-			"zksync": "ETH",
-		}
-		currency = native_by_chain.get(_normalize_chain_name(chain), "ETH")
+		currency = _NATIVE_CURRENCY.get(_normalize_chain_name(chain), "ETH")
 
 	return amount, currency
 
-def _extract_tx_from_and_gas(raw_tx_hex: str) -> tuple[Optional[str], Optional[int], Optional[int]]:
-	"""Extract from_address, gas_limit, and gas_price_wei (best-effort) from raw tx.
+def _recover_sender(raw_tx: bytes) -> Optional[str]:
+	"""Recover the signer of a raw tx (best-effort).
 
-	Returns (from_address, gas_limit, gas_price_wei).
+	This is an ECDSA public-key recovery costing milliseconds without a native
+	backend, so it only runs in a worker thread inside the webhook task.
 	"""
-	from_address: Optional[str] = None
-	gas_limit: Optional[int] = None
-	gas_price_wei: Optional[int] = None
-
-	decoded = None
-	# Try legacy first
 	try:
-		from eth_account._utils.legacy_transactions import decode_transaction as decode_legacy
-		decoded = decode_legacy(raw_tx_hex)
+		return Account.recover_transaction(raw_tx)
 	except Exception:
-		decoded = None
-	# Fallback to typed/EIP-1559
-	if decoded is None:
-		try:
-			from eth_account._utils.typed_transactions import decode_transaction as decode_typed
-			decoded = decode_typed(raw_tx_hex)
-		except Exception:
-			decoded = None
+		return None
 
+# chain key → env var name
+_CHAIN_ENV: Mapping[str, str] = MappingProxyType({
+	"ethereum": "RPC_URL_ETHEREUM",
+	"eth": "RPC_URL_ETHEREUM",
+	"sepolia": "RPC_URL_SEPOLIA",
+	"polygon": "RPC_URL_POLYGON",
+	"matic": "RPC_URL_POLYGON",
+	"arbitrum": "RPC_URL_ARBITRUM",
+	"arb": "RPC_URL_ARBITRUM",
+	"optimism": "RPC_URL_OPTIMISM",
+	"base": "RPC_URL_BASE",
+	"zksync": "RPC_URL_ZKSYNC",
+	"linea": "RPC_URL_LINEA",
+	"scroll": "RPC_URL_SCROLL",
+	"immutable": "RPC_URL_IMMUTABLE",
+	"taiko": "RPC_URL_TAIKO",
+	"bsc": "RPC_URL_BSC",
+	"binance-smart-chain": "RPC_URL_BSC",
+	"avalanche": "RPC_URL_AVALANCHE",
+	"avax": "RPC_URL_AVALANCHE",
+	"fantom": "RPC_URL_FANTOM",
+	"ftm": "RPC_URL_FANTOM",
+	"gnosis": "RPC_URL_GNOSIS",
+	"celo": "RPC_URL_CELO",
+	"moonbeam": "RPC_URL_MOONBEAM",
+	"aurora": "RPC_URL_AURORA",
+	"cronos": "RPC_URL_CRONOS",
+	"mantle": "RPC_URL_MANTLE",
+	"polygon-zkevm": "RPC_URL_POLYGON_ZKEVM",
+	"polygon_zkevm": "RPC_URL_POLYGON_ZKEVM",
+})
+# Resolved once at import so the request path never touches os.environ
+_RPC_URLS: Dict[str, str] = {env: url for env in set(_CHAIN_ENV.values()) if (url := os.getenv(env))}
+
+def _get_rpc_session() -> ClientSession:
+	"""Keepalive aiohttp session shared by every Web3 provider, so RPC calls reuse warm TLS connections"""
+	global _rpc_session
+	if _rpc_session is None or _rpc_session.closed:
+		_rpc_session = ClientSession(
+			# RPC hosts are a handful of fixed endpoints; keep their DNS answers for 5 minutes
+			connector=TCPConnector(limit=64, limit_per_host=32, keepalive_timeout=30, ttl_dns_cache=300),
+			timeout=ClientTimeout(total=RPC_TIMEOUT_SECONDS),
+		)
+	return _rpc_session
+
+async def _build_w3(env_name: str, url: str) -> AsyncWeb3:
+	provider = AsyncHTTPProvider(url, request_kwargs={"timeout": ClientTimeout(total=RPC_TIMEOUT_SECONDS)})
+	await provider.cache_async_session(_get_rpc_session())
+	w3 = AsyncWeb3(provider)
 	try:
-		if decoded:
-			from_address = decoded.get("from") or decoded.get("sender")
-			gas_limit = decoded.get("gas") or decoded.get("gasLimit")
-			gp = decoded.get("gasPrice")
-			if gp is None:
-				gp = decoded.get("maxFeePerGas") or decoded.get("max_fee_per_gas")
-			if gp is not None:
-				gas_price_wei = int(gp)
-	except Exception:
-		pass
+		# Cheap probe that also primes the keepalive pool (TCP + TLS) before the first relay
+		chain_id = await asyncio.wait_for(w3.eth.chain_id, timeout=RPC_TIMEOUT_SECONDS)
+		logger.info(f"RPC {env_name} ready (chain_id={chain_id})")
+	except Exception as e:
+		logger.warning(f"RPC {env_name} warm-up failed, client kept for later requests: {e}")
+	return w3
 
-	return from_address, gas_limit, gas_price_wei
+async def _init_w3_clients() -> None:
+	"""Build one client per configured RPC URL and register it under every chain alias.
 
-def get_w3(chain: str) -> Web3:
+	Warm-up probes run concurrently, so startup waits for the slowest RPC rather than all of them.
+	"""
+	clients = await asyncio.gather(*(_build_w3(env_name, url) for env_name, url in _RPC_URLS.items()))
+	clients_by_env: Dict[str, AsyncWeb3] = dict(zip(_RPC_URLS, clients))
+	for chain, env_name in _CHAIN_ENV.items():
+		if env_name in clients_by_env:
+			w3_clients[chain] = clients_by_env[env_name]
+
+def get_w3(chain: str) -> AsyncWeb3:
 	key = chain.lower()
-	if key not in w3_clients:
-		# chain key → env var name
-		mapping = {
-			"ethereum": "RPC_URL_ETHEREUM",
-			"eth": "RPC_URL_ETHEREUM",
-			"sepolia": "RPC_URL_SEPOLIA",
-			"polygon": "RPC_URL_POLYGON",
-			"matic": "RPC_URL_POLYGON",
-			"arbitrum": "RPC_URL_ARBITRUM",
-			"arb": "RPC_URL_ARBITRUM",
-			"optimism": "RPC_URL_OPTIMISM",
-			"base": "RPC_URL_BASE",
-			"zksync": "RPC_URL_ZKSYNC",
-			"linea": "RPC_URL_LINEA",
-			"scroll": "RPC_URL_SCROLL",
-			"immutable": "RPC_URL_IMMUTABLE",
-			"taiko": "RPC_URL_TAIKO",
-			"bsc": "RPC_URL_BSC",
-			"binance-smart-chain": "RPC_URL_BSC",
-			"avalanche": "RPC_URL_AVALANCHE",
-			"avax": "RPC_URL_AVALANCHE",
-			"fantom": "RPC_URL_FANTOM",
-			"ftm": "RPC_URL_FANTOM",
-			"gnosis": "RPC_URL_GNOSIS",
-			"celo": "RPC_URL_CELO",
-			"moonbeam": "RPC_URL_MOONBEAM",
-			"aurora": "RPC_URL_AURORA",
-			"cronos": "RPC_URL_CRONOS",
-			"mantle": "RPC_URL_MANTLE",
-			"polygon-zkevm": "RPC_URL_POLYGON_ZKEVM",
-			"polygon_zkevm": "RPC_URL_POLYGON_ZKEVM",
-		}
-		env_name = mapping.get(key, "RPC_URL_ETHEREUM")
-		url = os.getenv(env_name)
-		print(f"Getting RPC URL for chain '{key}', env var '{env_name}': {url[:50] if url else 'NOT SET'}...")
-		if not url:
+	w3 = w3_clients.get(key)
+	if w3 is None:
+		env_name = _CHAIN_ENV.get(key, "RPC_URL_ETHEREUM")
+		if key not in _CHAIN_ENV:
+			w3 = w3_clients.get("ethereum")
+		if w3 is None:
 			raise HTTPException(status_code=500, detail=f"Missing RPC URL for {key} (env var: {env_name})")
-		try:
-			w3_clients[key] = Web3(Web3.HTTPProvider(url))
-			# Test the connection
-			is_connected = w3_clients[key].is_connected()
-			print(f"Web3 connection test for {key}: {'SUCCESS' if is_connected else 'FAILED'}")
-			if not is_connected:
-				raise HTTPException(status_code=500, detail=f"Could not connect to RPC for {key}")
-		except Exception as e:
-			print(f"Error creating Web3 client for {key}: {e}")
-			raise HTTPException(status_code=500, detail=f"Failed to create Web3 client for {key}: {str(e)}")
-	return w3_clients[key]
+	return w3
 
 
 sanctions_checker = local_sanctions_checker
+# address (lowercase) -> sanctioned?; purged whenever the sanctions list changes
+_sanction_cache = TTLCache(maxsize=200_000, ttl=300)
+sanctions_checker.subscribe(_sanction_cache.clear)
+
+
+def _is_sanctioned(address: str) -> bool:
+	# Picks up external edits to the list file; a reload clears _sanction_cache via subscribe()
+	sanctions_checker.maybe_reload()
+	key = (address or "").lower()
+	hit = _sanction_cache.get(key)
+	if hit is None:
+		hit = sanctions_checker.is_sanctioned(address)
+		_sanction_cache[key] = hit
+	return hit
+
+
+async def _none() -> None:
+	return None
+
+
+def _spawn(coro) -> asyncio.Task:
+	"""Schedule a fire-and-forget coroutine, holding a reference until it completes"""
+	task = asyncio.create_task(coro)
+	_background_tasks.add(task)
+	task.add_done_callback(_background_tasks.discard)
+	return task
+
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+def _get_http_client() -> httpx.AsyncClient:
+	"""Keepalive client for outbound third-party calls (IPinfo, webhook) instead of a new TCP+TLS connection per call"""
+	global _http_client
+	if _http_client is None or _http_client.is_closed:
+		_http_client = httpx.AsyncClient(limits=httpx.Limits(max_connections=100, max_keepalive_connections=20))
+	return _http_client
+
+
 async def get_geo_data(client_ip: str) -> Optional[Dict[str, Any]]:
 	"""Get geolocation data from IPinfo Lite API"""
 	ipinfo_token = os.getenv("IPINFO_TOKEN")
 	if not ipinfo_token:
-		print("Warning: IPINFO_TOKEN not set, skipping geo lookup")
+		logger.debug("IPINFO_TOKEN not set, skipping geo lookup")
 		return None
 	
 	try:
-		async with httpx.AsyncClient() as client:
-			response = await client.get(
-				f"https://api.ipinfo.io/lite/{client_ip}?token={ipinfo_token}",
-				timeout=3.0
-			)
-			if response.status_code == 200:
-				return response.json()
-			else:
-				print(f"Warning: IPinfo API failed with status {response.status_code}")
-				return None
+		response = await _get_http_client().get(
+			f"https://api.ipinfo.io/lite/{client_ip}?token={ipinfo_token}",
+			timeout=3.0
+		)
+		if response.status_code == 200:
+			return response.json()
+		else:
+			logger.warning("IPinfo API failed with status %s", response.status_code)
+			return None
 	except Exception as e:
-		print(f"Warning: Failed to get geo data: {e}")
+		logger.warning("Failed to get geo data: %s", e)
 		return None
 
 def get_real_client_ip(request: Request) -> str:
@@ -484,49 +581,46 @@ def get_real_client_ip(request: Request) -> str:
 	# Fallback to direct client IP
 	return request.client.host if request.client else "unknown"
 
-async def call_webhook(transaction_data: Dict[str, Any], api_key: str) -> None:
-	"""Call the main app's webhook to log transaction data"""
+async def call_webhook(transaction_data: Dict[str, Any], api_key: str, raw_tx: Optional[bytes] = None) -> None:
+	"""Call the main app's webhook to log transaction data.
+
+	When `raw_tx` is given, from_address is recovered from it here, off the request path.
+	"""
 	webhook_url = "https://yfwbsjokktasumghrznk.supabase.co/functions/v1/relay-webhook"
 	
+	if raw_tx is not None:
+		transaction_data["from_address"] = await asyncio.to_thread(_recover_sender, raw_tx)
+	
 	# Add API key hash to transaction data for user identification
 	transaction_data["api_key_hash"] = api_key
 	
 	try:
-		async with httpx.AsyncClient() as client:
-			response = await client.post(
-				webhook_url,
-				json=transaction_data,
-				timeout=10.0
-			)
-			if response.status_code == 200:
-				print(f"✅ Successfully sent transaction data to webhook")
-			else:
-				print(f"⚠️ Webhook call failed with status {response.status_code}: {response.text}")
+		response = await _get_http_client().post(
+			webhook_url,
+			json=transaction_data,
+			timeout=10.0
+		)
+		if response.status_code == 200:
+			logger.debug("Sent transaction data to webhook")
+		else:
+			logger.warning("Webhook call failed with status %s: %s", response.status_code, response.text)
 	except Exception as e:
-		print(f"❌ Error calling webhook: {e}")
+		logger.warning("Error calling webhook: %s", e)
 
 
-def get_partner_id_and_api_key(authorization: Optional[str] = Header(default=None)) -> tuple[str, str]:
-	# Support both "Bearer <key>" and raw key in Authorization header,
-	# and also FastAPI HTTPBearer if configured later.
-	api_key = None
-	if authorization:
-		api_key = authorization[7:] if authorization.startswith("Bearer ") else authorization
-	if not api_key:
-		raise HTTPException(status_code=401, detail="Missing API key")
-	
+async def _resolve_api_key(api_key: str) -> tuple[str, str]:
 	try:
-		sb = get_supabase()
-		# Try to find by key_hash first (primary storage), then by key (fallback)
-		res = sb.table("api_keys").select("partner_id,is_active").eq("key_hash", api_key).limit(1).execute()
-		rows = res.data or []
-		found_by_hash = bool(rows)
-		if not rows:
-			# Fallback to key column if key_hash not found
-			res = sb.table("api_keys").select("partner_id,is_active").eq("key", api_key).limit(1).execute()
-			rows = res.data or []
-		
-		row = rows[0] if rows else None
+		# Reject anything that could break out of the PostgREST filter below
+		if not _API_KEY_RE.fullmatch(api_key):
+			raise HTTPException(status_code=403, detail="API key not found")
+		# One round-trip; key_hash = sha256(key) (primary storage) wins over key (legacy
+		# raw-key column). The stored hash itself is never accepted as a credential.
+		key_sha = hashlib.sha256(api_key.encode()).hexdigest()
+		rows = await query(
+			"api_keys", "partner_id,is_active,key_hash",
+			or_=f"(key_hash.eq.{key_sha},key.eq.{api_key})", limit=2,
+		)
+		row = next((r for r in rows if r.get("key_hash") == key_sha), rows[0] if rows else None)
 		if not row:
 			raise HTTPException(status_code=403, detail="API key not found")
 		if not row.get("is_active"):
@@ -536,17 +630,45 @@ def get_partner_id_and_api_key(authorization: Optional[str] = Header(default=Non
 		if not partner_id:
 			raise HTTPException(status_code=500, detail="API key missing partner_id")
 		
-		# Return the key for webhook identification (use hash if found by hash, otherwise original key)
-		webhook_key = api_key if found_by_hash else api_key
-		return str(partner_id), webhook_key
+		# Identify the caller to the webhook by the key's hash, never the raw key
+		result = (str(partner_id), key_sha)
+		_api_key_cache[api_key] = result
+		return result
 	except HTTPException:
 		raise
 	except Exception as e:
-		print(f"Error validating API key: {e}")
+		logger.error("Error validating API key: %s", e)
 		raise HTTPException(status_code=500, detail="Internal server error during API key validation")
 
-def get_partner_id_from_api_key(authorization: Optional[str] = Header(default=None)) -> str:
-	partner_id, _ = get_partner_id_and_api_key(authorization)
+
+async def get_partner_id_and_api_key(authorization: Optional[str] = Header(default=None)) -> tuple[str, str]:
+	# Support both "Bearer <key>" and raw key in Authorization header,
+	# and also FastAPI HTTPBearer if configured later.
+	api_key = None
+	if authorization:
+		api_key = authorization[7:] if authorization.startswith("Bearer ") else authorization
+	if not api_key:
+		raise HTTPException(status_code=401, detail="Missing API key")
+	
+	cached = _api_key_cache.get(api_key)
+	if cached is not None:
+		return cached
+	
+	# Collapse concurrent misses for the same key into a single lookup
+	task = _api_key_inflight.get(api_key)
+	if task is None:
+		task = asyncio.ensure_future(_resolve_api_key(api_key))
+		_api_key_inflight[api_key] = task
+		task.add_done_callback(lambda _: _api_key_inflight.pop(api_key, None))
+	return await asyncio.shield(task)
+
+
+def invalidate_api_key(api_key: str) -> bool:
+	"""Drop a key from the auth cache (e.g. after revocation). Returns True if it was cached."""
+	return _api_key_cache.pop(api_key) is not None
+
+async def get_partner_id_from_api_key(authorization: Optional[str] = Header(default=None)) -> str:
+	partner_id, _ = await get_partner_id_and_api_key(authorization)
 	return partner_id
 
 
@@ -568,6 +690,23 @@ async def startup_event() -> None:
 		if expired_count > 0:
 			logger.info(f"Cleaned up {expired_count} expired confirmation codes")
 		
+		# Build the shared PostgREST client up front so the first request doesn't pay for it
+		try:
+			get_rest_client()
+		except RuntimeError as e:
+			logger.warning(f"Supabase REST client not initialized: {e}")
+		
+		# Build and serialize the OpenAPI schema now rather than on the first /docs or /openapi.json hit
+		_openapi_json()
+		
+		# Background writers for relay_logs, risk_events and risk_scores
+		for q in ALL_QUEUES:
+			q.start()
+		
+		# Build and warm Web3 clients so the first relay per chain skips the cold start
+		await _init_w3_clients()
+		logger.info(f"Initialized Web3 clients for {len(w3_clients)} chain aliases")
+		
 		# Local sanctions checker loads automatically on first use
 		logger.info("Startup complete - secure sanctions management system ready")
 		
@@ -576,6 +715,34 @@ async def startup_event() -> None:
 		raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+	"""Drain queued/in-flight background writes and release pooled connections"""
+	if _background_tasks:
+		await asyncio.gather(*_background_tasks, return_exceptions=True)
+	await asyncio.gather(*(q.stop() for q in ALL_QUEUES))
+	await close_rest_client()
+	if _http_client is not None:
+		await _http_client.aclose()
+	if _rpc_session is not None and not _rpc_session.closed:
+		await _rpc_session.close()
+
+
+_SANCTIONED_REASONS = ("SANCTIONS: Address found in sanctioned wallets list",)
+_ALLOW = (True, None, False)
+_ALERT = (True, "alert", True)
+_BLOCK = (False, "blocked", False)
+_BLOCK_BANDS = frozenset({"PROHIBITED", "HIGH", "CRITICAL"})
+# Band class: 0 = other, 1 = HIGH/CRITICAL, 2 = PROHIBITED (also used for sanctioned)
+_BAND_CLASS = {band: 2 if band == "PROHIBITED" else 1 for band in _BLOCK_BANDS}
+# _POLICY[band class][score bucket]; buckets: other, ==0, ==50, 80-99, >=100
+_POLICY = (
+	(_ALLOW, _ALLOW, _ALERT, _BLOCK, _BLOCK),
+	(_BLOCK, _ALLOW, _ALERT, _BLOCK, _BLOCK),
+	(_BLOCK, _BLOCK, _BLOCK, _BLOCK, _BLOCK),
+)
+
+
 def _apply_policy(sanctioned: bool, score: int, band: str) -> Tuple[bool, Optional[str], bool]:
 	"""Return (allowed, status, alert)
 	Policy:
@@ -584,30 +751,31 @@ def _apply_policy(sanctioned: bool, score: int, band: str) -> Tuple[bool, Option
 	- score==0 => allow
 	- HIGH/CRITICAL (>=80) => block
 	- else allow
+	Evaluated as a single lookup in _POLICY, with no branches.
 	"""
-	if sanctioned or band == "PROHIBITED" or score >= 100:
-		return False, "blocked", False
-	if score == 50:
-		return True, "alert", True
-	if score == 0:
-		return True, None, False
-	if band in {"HIGH", "CRITICAL"} or score >= 80:
-		return False, "blocked", False
-	return True, None, False
+	band_class = max(2 * sanctioned, _BAND_CLASS.get(band, 0))
+	bucket = (score == 0) + 2 * (score == 50) + 3 * (score >= 80) + (score >= 100)
+	return _POLICY[band_class][bucket]
 
 
 async def make_decision_with_risk(to_addr: str, features: Optional[List[FeatureHitIn]], 
                                  transaction_context: Optional[Dict] = None,
-                                 network_context: Optional[Dict] = None) -> tuple[Decision, List[str], Optional[str]]:
+                                 network_context: Optional[Dict] = None) -> tuple[Decision, Optional[str]]:
 	"""Enhanced risk assessment using the new enterprise risk model.
-	Returns (Decision, reasons, status)
+	Returns (Decision, status); decision.reasons is the final reasons list.
+
+	Decisions are built with model_construct: every field is computed here, so
+	pydantic validation would only repeat work on the hot path.
 	"""
 	reasons: List[str] = []
-	sanctioned = sanctions_checker.is_sanctioned(to_addr)  # Now synchronous since it's local
+	sanctioned = _is_sanctioned(to_addr)
+	if sanctioned:
+		# Policy blocks sanctioned addresses whatever the score; skip scoring and risk writes
+		return Decision.model_construct(allowed=False, risk_band="PROHIBITED", risk_score=100, reasons=list(_SANCTIONED_REASONS)), "blocked"
 	
 	if features:
 		# Convert features to domain objects
-		hits = [f.to_domain() for f in features]
+		hits = FeatureHitIn.list_to_domain(features)
 		
 		# Use new risk model with context
 		score, band, reasons, applied = compute_risk_score(
@@ -617,24 +785,18 @@ async def make_decision_with_risk(to_addr: str, features: Optional[List[FeatureH
 			network_context=network_context
 		)
 		
-		try:
-			# Enhanced logging with new model
-			log_risk_events(to_addr, hits, applied)
-			upsert_risk_score(to_addr, score, band, reasons)
-		except Exception as e:
-			print(f"Warning: Failed to log risk data: {e}")
+		# Enhanced logging with new model (queued, written in batches off the request path)
+		log_risk_events(to_addr, hits, applied)
+		upsert_risk_score(to_addr, score, band, reasons)
 		
 		allowed, status, alert = _apply_policy(sanctioned, score, band)
 		if alert:
 			reasons = ["ALERT: risk_score==50"] + reasons
-		return Decision(allowed=allowed, risk_band=band, risk_score=score, reasons=reasons), reasons, status
+		return Decision.model_construct(allowed=allowed, risk_band=band, risk_score=score, reasons=reasons), status
 	
 	# No features provided - calculate base risk from transaction context only
 	if transaction_context:
 		# Create a minimal feature hit based on transaction context
-		from datetime import datetime, timezone
-		from .risk_model import FeatureHit
-		
 		# Calculate base risk from transaction context
 		base_risk = 0
 		context_reasons = []
@@ -669,27 +831,22 @@ async def make_decision_with_risk(to_addr: str, features: Optional[List[FeatureH
 			reasons = context_reasons + reasons
 		
 		allowed, status, alert = _apply_policy(sanctioned, score, band)
-		return Decision(allowed=allowed, risk_band=band, risk_score=score, reasons=reasons), reasons, status
+		return Decision.model_construct(allowed=allowed, risk_band=band, risk_score=score, reasons=reasons), status
 	
 	# Fallback to DB snapshot
-	sb = get_supabase()
-	res = sb.table("risk_scores").select("score,band,risk_factors").eq("wallet", (to_addr or "").lower()).limit(1).execute()
-	rows = res.data or []
+	cached = await get_cached_risk(to_addr)
 	
-	if rows:
-		data = rows[0]
-		score = int(round(data.get("score") or 0))
-		band = data.get("band") or "LOW"
-		reasons = data.get("risk_factors") or []
+	if cached:
+		score, band, reasons = cached
 		
 		allowed, status, alert = _apply_policy(sanctioned, score, band)
 		if alert:
 			reasons = ["ALERT: risk_score==50"] + reasons
-		return Decision(allowed=allowed, risk_band=band, risk_score=score, reasons=reasons), reasons, status
+		return Decision.model_construct(allowed=allowed, risk_band=band, risk_score=score, reasons=reasons), status
 	
 	# No cached score and no context → treat as 0
 	allowed, status, _ = _apply_policy(sanctioned, 0, "LOW")
-	return Decision(allowed=allowed, risk_band="LOW", risk_score=0, reasons=["No risk factors detected"]), [], status
+	return Decision.model_construct(allowed=allowed, risk_band="LOW", risk_score=0, reasons=["No risk factors detected"]), status
 
 
 @app.post("/v1/check", response_model=Decision)
@@ -701,82 +858,80 @@ async def v1_check(body: CheckRequest, partner_id: str = Depends(get_partner_id_
 		to_norm = body.to.strip()
 		if to_norm.lower() == "string":
 			raise HTTPException(status_code=400, detail="Invalid 'to' address. Use a real 0x... address (see example in docs).")
-		if not (to_norm.startswith("0x") and len(to_norm) == 42):
+		if not EVM_ADDR_RE.fullmatch(to_norm):
 			raise HTTPException(status_code=400, detail="Invalid 'to' address format. Expected 0x-prefixed EVM address.")
+		# One canonical (lowercase) form for sanctions, risk lookups and logs; matches what v1_relay derives from rawTx
+		to_norm = to_norm.lower()
 		
-		print(f"Processing check request for partner_id: {partner_id}, to: {to_norm}")
-		decision, reasons, status = await make_decision_with_risk(to_norm, body.features)
-		print(f"Decision: {decision.allowed}, risk_score: {decision.risk_score}, risk_band: {decision.risk_band}")
-		
-		# Log sanctions check result
-		is_sanctioned = sanctions_checker.is_sanctioned(to_norm)
-		if is_sanctioned:
-			print(f"🚫 SANCTIONED WALLET DETECTED in check: {to_norm}")
-		else:
-			print(f"✅ Wallet {to_norm} is clean in check")
+		decision, status = await make_decision_with_risk(to_norm, body.features)
+		if logger.isEnabledFor(logging.DEBUG):
+			logger.debug(
+				"check partner_id=%s to=%s sanctioned=%s allowed=%s risk_score=%s risk_band=%s",
+				partner_id, to_norm, _is_sanctioned(to_norm), decision.allowed, decision.risk_score, decision.risk_band,
+			)
 		
-		# log (best-effort)
-		try:
-			sb = get_supabase()
-			sb.table("relay_logs").insert({
-				"partner_id": partner_id,
-				"chain": body.chain,
-				"from_addr": body.from_addr or None,
-				"to_addr": body.to,
-				"decision": "allowed" if decision.allowed else "blocked",
-				"risk_band": decision.risk_band,
-				"risk_score": decision.risk_score,
-				"reasons": reasons or decision.reasons,
-				"created_at": now_iso(),
-			}).execute()
-		except Exception as e:
-			print(f"Warning: Failed to log request: {e}")
+		# log (best-effort, batched by the background writer)
+		relay_log_queue.put({
+			"partner_id": partner_id,
+			"chain": body.chain,
+			"from_addr": body.from_addr or None,
+			"to_addr": to_norm,
+			"decision": "allowed" if decision.allowed else "blocked",
+			"risk_band": decision.risk_band,
+			"risk_score": decision.risk_score,
+			"reasons": decision.reasons,
+			"idempotency_key": None,
+			"tx_hash": None,
+			"created_at": now_iso(),
+		})
 		
-		return JSONResponse(content=decision.model_dump())
+		return ORJSONResponse(content=decision.model_dump())
 	except HTTPException:
 		raise
 	except Exception as e:
-		print(f"Error in v1_check: {e}")
+		logger.error("Error in v1_check: %s", e)
 		raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+# Broadcast error substring -> (status, client-facing detail), checked in order
+_RPC_ERRORS = (
+	("insufficient funds", 400, "Insufficient funds for transaction"),
+	("nonce too low", 400, "Transaction nonce too low (transaction already processed)"),
+	("already known", 400, "Transaction already known to network"),
+	("gas price too low", 400, "Gas price too low for current network conditions"),
+	("chain not found", 400, "Chain '{chain}' not supported or RPC not configured"),
+)
+
+
 @app.post("/v1/relay", response_model=RelayResponse)
 async def v1_relay(body: RelayRequest, request: Request, partner_and_key: tuple[str, str] = Depends(get_partner_id_and_api_key)):
 	partner_id, api_key = partner_and_key
 	
 	# Capture real client IP (handles proxies/CDNs) for geolocation
 	client_ip = get_real_client_ip(request)
-	api_caller_geo = await get_geo_data(client_ip)
-	
-	# Priority: 1) user_geo (if user implements it), 2) real client IP geo (fallback)
-	geo_data = body.user_geo if body.user_geo else api_caller_geo
 	
-	if not is_hex_string(body.rawTx):
-		raise HTTPException(status_code=400, detail="rawTx must be 0x-hex string")
-
-	to = extract_to_address(body.rawTx)
+	raw_tx_bytes = decode_hex(body.rawTx)
+	if not raw_tx_bytes:
+		raise HTTPException(status_code=400, detail="rawTx must be a hex string")
+
+	# Single RLP decode shared by the to-address check, amount/gas extraction and debug logging
+	tx_fields = decode_tx_fields(raw_tx_bytes)
+	if tx_fields is None:
+		raise HTTPException(status_code=400, detail="rawTx is not a valid signed transaction")
+	to = tx_fields["to"]
 	if to is None:
 		raise HTTPException(status_code=400, detail="Missing 'to' in rawTx (contract creation not supported)")
 
 	# Normalize chain and extract transaction context for enhanced risk scoring
 	chain_normalized = _normalize_chain_name(body.chain)
-	transaction_context = None
-	try:
-		# Parse raw transaction to get basic info
-		raw_bytes = Web3.to_bytes(hexstr=body.rawTx)
-		if len(raw_bytes) > 0:
-			# Basic transaction analysis
-			transaction_context = {
-				"data_size": len(raw_bytes),
-				"is_contract": len(raw_bytes) > 21000,  # More than basic ETH transfer
-				"raw_tx_length": len(body.rawTx)
-			}
-	except Exception as e:
-		print(f"Warning: Could not parse transaction context: {e}")
+	# Basic transaction analysis on the bytes decoded above
+	transaction_context = {
+		"data_size": len(raw_tx_bytes),
+		"is_contract": len(raw_tx_bytes) > 21000,  # More than basic ETH transfer
+		"raw_tx_length": len(body.rawTx)
+	}
 
-	# Extract amounts (native or ERC-20) best-effort
-	amount_value, amount_currency = _decode_native_and_token_amounts(body.rawTx, chain_normalized)
-	from_address, gas_limit, gas_price_wei = _extract_tx_from_and_gas(body.rawTx)
+	gas_limit, gas_price_wei = tx_fields["gas"], tx_fields["gasPrice"]  # gasPrice is maxFeePerGas for EIP-1559
 	gas_price_gwei: Optional[float] = None
 	try:
 		if gas_price_wei is not None:
@@ -784,43 +939,39 @@ async def v1_relay(body: RelayRequest, request: Request, partner_and_key: tuple[
 	except Exception:
 		gas_price_gwei = None
 	
-	# Check sanctions first and log clearly
-	is_sanctioned = sanctions_checker.is_sanctioned(to)
-	if is_sanctioned:
-		print(f"🚫 SANCTIONED WALLET DETECTED in relay: {to}")
-		print(f"   Transaction will be BLOCKED from broadcasting")
-	else:
-		print(f"✅ Wallet {to} is clean in relay - proceeding with risk assessment")
-	
-	decision, reasons, status = await make_decision_with_risk(to, body.features, transaction_context)
-
-	# pre-log
-	log_id: Optional[int] = None
-	sb = get_supabase()
-	try:
-		ins = sb.table("relay_logs").insert({
-			"partner_id": partner_id,
-			"chain": chain_normalized,
-			"from_addr": None,
-			"to_addr": to,
-			"decision": "allowed" if decision.allowed else "blocked",
-			"risk_band": decision.risk_band,
-			"risk_score": decision.risk_score,
-			"reasons": reasons or decision.reasons,
-			"idempotency_key": body.idempotencyKey or None,
-			"created_at": now_iso(),
-		}).select("id").execute()
-		rows = ins.data or []
-		if rows:
-			log_id = rows[0].get("id")
-	except Exception:
-		pass
+	# Risk decision, amount decode (native or ERC-20, best-effort) and the geo lookup
+	# are independent I/O; run them concurrently instead of back to back.
+	# Priority: 1) user_geo (if user implements it), 2) real client IP geo (fallback)
+	(decision, status), (amount_value, amount_currency), api_caller_geo = await asyncio.gather(
+		make_decision_with_risk(to, body.features, transaction_context),
+		_decode_native_and_token_amounts(tx_fields, chain_normalized),
+		get_geo_data(client_ip) if not body.user_geo else _none(),
+	)
+	geo_data = body.user_geo if body.user_geo else api_caller_geo
+	reasons = decision.reasons
+
+	# Written once per relay, after the outcome (and tx_hash) is known; same columns as the check row
+	log_row = {
+		"partner_id": partner_id,
+		"chain": chain_normalized,
+		"from_addr": None,
+		"to_addr": to,
+		"decision": "allowed" if decision.allowed else "blocked",
+		"risk_band": decision.risk_band,
+		"risk_score": decision.risk_score,
+		"reasons": reasons,
+		"idempotency_key": body.idempotencyKey or None,
+		"tx_hash": None,
+		"created_at": now_iso(),
+	}
 
 	if not decision.allowed:
+		relay_log_queue.put(log_row)
+		
 		# Send blocked transaction data to webhook
 		webhook_data = {
 			"partner_id": partner_id,
-			"from_address": from_address,
+			"from_address": None,  # recovered inside the webhook task
 			"to_address": to,
 			"amount": amount_value or 0,
 			"currency": amount_currency or "ETH",
@@ -829,7 +980,7 @@ async def v1_relay(body: RelayRequest, request: Request, partner_and_key: tuple[
 			"status": "blocked",
 			"risk_level": decision.risk_band,
 			"risk_score": decision.risk_score,
-			"description": f"Transaction blocked: {', '.join(reasons or decision.reasons)}",
+			"description": f"Transaction blocked: {', '.join(reasons)}",
 			"client_ip": client_ip,
 			"geo_data": geo_data,
 			"gas_price": gas_price_gwei,
@@ -842,50 +993,33 @@ async def v1_relay(body: RelayRequest, request: Request, partner_and_key: tuple[
 		
 		# Call webhook (non-blocking)
 		try:
-			import asyncio
-			asyncio.create_task(call_webhook(webhook_data, api_key))
+			_spawn(call_webhook(webhook_data, api_key, raw_tx_bytes))
 		except Exception as e:
-			print(f"Warning: Failed to call webhook for blocked transaction: {e}")
+			logger.warning("Failed to call webhook for blocked transaction: %s", e)
 		
-		return JSONResponse(status_code=403, content={
+		return ORJSONResponse(status_code=403, content={
 			"allowed": False,
 			"risk_band": decision.risk_band,
 			"risk_score": decision.risk_score,
-			"reasons": reasons or decision.reasons,
+			"reasons": reasons,
 			"status": "blocked",
 		})
 
 	# broadcast (allowed or alert)
 	try:
-		print(f"Attempting to broadcast transaction for chain: {chain_normalized}")
 		w3 = get_w3(chain_normalized)
-		print(f"Web3 instance created successfully")
-		
-		raw_bytes = Web3.to_bytes(hexstr=body.rawTx)
-		print(f"Raw transaction converted to bytes, length: {len(raw_bytes)}")
 		
-		# Try to decode the transaction first to validate it
-		try:
-			from eth_account._utils.legacy_transactions import decode_transaction
-			decoded_tx = decode_transaction(body.rawTx)
-			print(f"Transaction decoded successfully, from: {decoded_tx['from']}, to: {decoded_tx['to']}, nonce: {decoded_tx['nonce']}")
-		except Exception as decode_error:
-			print(f"Warning: Could not decode transaction: {decode_error}")
+		logger.debug("Broadcasting tx type=%s to=%s on %s", tx_fields["type"], to, chain_normalized)
 		
-		tx_hash = w3.eth.send_raw_transaction(raw_bytes)
-		print(f"Transaction broadcast successful, hash: {tx_hash}")
+		tx_hash = await asyncio.wait_for(w3.eth.send_raw_transaction(raw_tx_bytes), timeout=RPC_TIMEOUT_SECONDS)
 		
 		tx_hex = tx_hash.hex() if hasattr(tx_hash, "hex") else Web3.to_hex(tx_hash)
-		if log_id is not None:
-			try:
-				sb.table("relay_logs").update({"tx_hash": tx_hex}).eq("id", log_id).execute()
-			except Exception as log_error:
-				print(f"Warning: Failed to update log with tx_hash: {log_error}")
+		relay_tx_log_queue.put({**log_row, "tx_hash": tx_hex})
 		
 		# Send successful transaction data to webhook
 		webhook_data = {
 			"partner_id": partner_id,
-			"from_address": from_address,
+			"from_address": None,  # recovered inside the webhook task
 			"to_address": to,
 			"amount": amount_value or 0,
 			"currency": amount_currency or "ETH",
@@ -907,45 +1041,42 @@ async def v1_relay(body: RelayRequest, request: Request, partner_and_key: tuple[
 		
 		# Call webhook (non-blocking)
 		try:
-			import asyncio
-			asyncio.create_task(call_webhook(webhook_data, api_key))
+			_spawn(call_webhook(webhook_data, api_key, raw_tx_bytes))
 		except Exception as e:
-			print(f"Warning: Failed to call webhook for successful transaction: {e}")
+			logger.warning("Failed to call webhook for successful transaction: %s", e)
 		
-		return JSONResponse(content={
+		return ORJSONResponse(content={
 			"allowed": True,
 			"risk_band": decision.risk_band,
 			"risk_score": decision.risk_score,
 			"txHash": tx_hex,
-			"reasons": reasons or decision.reasons,
+			"reasons": reasons,
 			"status": status,
 		})
 	except Exception as e:
-		print(f"Error broadcasting transaction: {e}")
-		print(f"Error type: {type(e)}")
+		relay_log_queue.put(log_row)
+		logger.warning("Error broadcasting transaction on %s: %s: %s", chain_normalized, type(e).__name__, e)
 		
 		# Determine specific error type and provide helpful message
 		error_detail = str(e)
-		if "insufficient funds" in error_detail.lower():
-			status_code = 400
-			detail = "Insufficient funds for transaction"
-		elif "nonce too low" in error_detail.lower():
-			status_code = 400
-			detail = "Transaction nonce too low (transaction already processed)"
-		elif "already known" in error_detail.lower():
-			status_code = 400
-			detail = "Transaction already known to network"
-		elif "gas price too low" in error_detail.lower():
-			status_code = 400
-			detail = "Gas price too low for current network conditions"
-		elif "chain not found" in error_detail.lower():
-			status_code = 400
-			detail = f"Chain '{chain_normalized}' not supported or RPC not configured"
-		else:
-			status_code = 500
-			detail = f"Transaction broadcast failed: {error_detail}"
-		
-		raise HTTPException(status_code=status_code, detail=detail)
+		if isinstance(e, asyncio.TimeoutError):
+			raise HTTPException(status_code=504, detail="RPC timed out while broadcasting transaction")
+		error_lower = error_detail.lower()
+		for needle, status_code, detail in _RPC_ERRORS:
+			if needle in error_lower:
+				raise HTTPException(status_code=status_code, detail=detail.format(chain=chain_normalized))
+		raise HTTPException(status_code=500, detail=f"Transaction broadcast failed: {error_detail}")
+
+
+@app.post("/v1/admin/invalidate_key", include_in_schema=False)
+async def admin_invalidate_key(body: InvalidateKeyRequest, x_admin_token: Optional[str] = Header(default=None)):
+	"""Evict a revoked API key from the auth cache without waiting for the TTL"""
+	admin_token = os.getenv("RELAY_ADMIN_TOKEN")
+	if not admin_token:
+		raise HTTPException(status_code=403, detail="Admin token not configured")
+	if not x_admin_token or not hmac.compare_digest(x_admin_token, admin_token):
+		raise HTTPException(status_code=403, detail="Invalid admin token")
+	return {"success": True, "evicted": invalidate_api_key(body.api_key)}
 
 
 @app.get("/v1/sanctions/list")
@@ -956,13 +1087,9 @@ async def get_sanctions_list(partner_id: str = Depends(get_partner_id_from_api_k
 		sanctioned_count = sanctions_checker.get_sanctioned_count()
 		
 		# Read the JSON file to get the full list
-		import json
-		from pathlib import Path
-		
-		file_path = Path(__file__).parent.parent / "sanctioned_wallets.json"
+		file_path = sanctions_checker.file_path
 		if file_path.exists():
-			with open(file_path, 'r', encoding='utf-8') as f:
-				data = json.load(f)
+			data = orjson.loads(file_path.read_bytes())
 			
 			return {
 				"success": True,
@@ -982,7 +1109,7 @@ async def get_sanctions_list(partner_id: str = Depends(get_partner_id_from_api_k
 			}
 			
 	except Exception as e:
-		print(f"Error getting sanctions list: {e}")
+		logger.error("Error getting sanctions list: %s", e)
 		raise HTTPException(status_code=500, detail=f"Failed to retrieve sanctions list: {str(e)}")
 
 
@@ -1002,7 +1129,7 @@ async def manage_sanctions(
 			raise HTTPException(status_code=400, detail="Invalid address format")
 		# Already sanctioned? quick exit
 		if sanctions_checker.is_sanctioned(addr):
-			return JSONResponse(status_code=409, content={
+			return ORJSONResponse(status_code=409, content={
 				"success": False,
 				"message": f"Address {addr} is already in sanctions list",
 				"address": addr,
@@ -1058,11 +1185,11 @@ async def check_sanctions_status(address: str, partner_id: str = Depends(get_par
 	"""Check if a specific wallet address is sanctioned"""
 	try:
 		# Validate address format
-		if not address.startswith("0x") or len(address) != 42:
+		if not EVM_ADDR_RE.fullmatch(address):
 			raise HTTPException(status_code=400, detail="Invalid wallet address format. Must be 0x-prefixed 42-character hex string.")
 		
 		# Check sanctions status
-		is_sanctioned = sanctions_checker.is_sanctioned(address)
+		is_sanctioned = _is_sanctioned(address)
 		
 		return {
 			"address": address,
@@ -1075,7 +1202,7 @@ async def check_sanctions_status(address: str, partner_id: str = Depends(get_par
 	except HTTPException:
 		raise
 	except Exception as e:
-		print(f"Error checking sanctions status: {e}")
+		logger.error("Error checking sanctions status: %s", e)
 		raise HTTPException(status_code=500, detail=f"Failed to check sanctions status: {str(e)}")
 
 
@@ -2,6 +2,12 @@ from pydantic import BaseModel, Field, validator
 from typing import List, Optional, Literal
 from datetime import datetime
 
+try:
+    from .utils import EVM_ADDR_RE
+except ImportError:
+    # Imported as a top-level module (app/ on sys.path)
+    from utils import EVM_ADDR_RE
+
 # Existing models...
 
 class SanctionsManageRequest(BaseModel):
@@ -29,7 +35,7 @@ class WalletRiskAssessmentRequest(BaseModel):
     
     @validator('address')
     def validate_address(cls, v):
-        if not v.startswith('0x') or len(v) != 42:
+        if not EVM_ADDR_RE.fullmatch(v):
             raise ValueError('Invalid Ethereum address format')
         return v.lower()
 
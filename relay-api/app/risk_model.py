@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timezone
 from math import exp, log
 from typing import Any, Dict, List, Tuple, Optional
 import json
+import logging
 
-from .supabase_client import get_supabase
+from .cache import TTLCache
+from .supabase_client import query
+from .write_behind import risk_event_queue, risk_score_queue
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -31,6 +37,11 @@ class RiskProfile:
     suspicious_patterns: List[str]
 
 
+# wallet (lowercase) -> (score, band, risk_factors), or None when no snapshot exists
+_risk_cache = TTLCache(maxsize=100_000, ttl=30)
+_NOT_CACHED = object()
+
+
 # Enterprise Risk Factor Categories
 RISK_CATEGORIES = {
     "SANCTIONS": {
@@ -161,12 +172,23 @@ def _calculate_network_risk(associated_addresses: List[str],
     return risk
 
 
-def _decay(weight: float, occurred_at: datetime, half_life_days: int) -> float:
-    """Apply time-based decay to risk weights"""
-    age_days = max(0.0, (datetime.now(timezone.utc) - occurred_at.astimezone(timezone.utc)).total_seconds() / 86400.0)
+def _decay(weight: float, occurred_at: datetime, half_life_days: int,
+           now_ts: Optional[float] = None) -> float:
+    """Apply time-based decay to risk weights (`now_ts` is a POSIX timestamp)"""
+    if now_ts is None:
+        now_ts = datetime.now(timezone.utc).timestamp()
+    # timestamp() is tz-correct for aware datetimes (and treats naive ones as local, like astimezone did)
+    age_days = max(0.0, (now_ts - occurred_at.timestamp()) / 86400.0)
     return weight * exp(-(age_days / max(1.0, float(half_life_days))))
 
 
+@lru_cache(maxsize=1024)
+def _category_for(key: str) -> Dict[str, Any]:
+    """Config of the first category whose name prefixes `key` (BEHAVIORAL if none)"""
+    category = next((cat for cat in RISK_CATEGORIES.keys() if key.startswith(cat)), "BEHAVIORAL")
+    return RISK_CATEGORIES.get(category, RISK_CATEGORIES["BEHAVIORAL"])
+
+
 def _soft_cap(sum_weights: float) -> float:
     """Apply soft cap to prevent scores from exceeding 100"""
     return 100.0 * (1.0 - exp(-(sum_weights / 100.0)))
@@ -214,15 +236,16 @@ def compute_risk_score(hits: List[FeatureHit], sanctions_match: bool,
     reasons: List[str] = []
     contributions: List[Tuple[str, int]] = []
     critical_factors = []
+    overrides = half_life_overrides or {}
+    now_ts = datetime.now(timezone.utc).timestamp()
     
     # Process feature hits with time decay
     for hit in hits:
-        category = next((cat for cat in RISK_CATEGORIES.keys() if hit.key.startswith(cat)), "BEHAVIORAL")
-        category_config = RISK_CATEGORIES.get(category, RISK_CATEGORIES["BEHAVIORAL"])
+        category_config = _category_for(hit.key)
         
         # Apply time decay
-        half_life = (half_life_overrides or {}).get(hit.key, category_config["half_life_days"])
-        decayed_weight = _decay(hit.base, hit.occurred_at, half_life)
+        half_life = overrides.get(hit.key, category_config["half_life_days"])
+        decayed_weight = _decay(hit.base, hit.occurred_at, half_life, now_ts)
         
         # Apply category-specific adjustments
         if category_config["critical"]:
@@ -284,13 +307,10 @@ def compute_risk_score(hits: List[FeatureHit], sanctions_match: bool,
 
 def _summarize_details(details: Dict[str, Any]) -> str:
     """Summarize feature details for human readability"""
-    parts: List[str] = []
-    for k, v in details.items():
-        if isinstance(v, float):
-            parts.append(f"{k}={v:.2f}")
-        else:
-            parts.append(f"{k}={v}")
-    return ", ".join(parts)
+    return ", ".join(
+        f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}"
+        for k, v in details.items()
+    )
 
 
 def create_risk_profile(wallet: str, score: int, band: str, 
@@ -310,56 +330,66 @@ def create_risk_profile(wallet: str, score: int, band: str,
 
 
 # Enhanced persistence helpers
+# Both only enqueue: the write-behind workers batch rows from many requests into one insert/upsert.
 def log_risk_events(wallet: str, hits: List[FeatureHit], applied: List[Tuple[str, int]]) -> None:
     """Log risk events to database for audit trail"""
-    sb = get_supabase()
-    rows: List[Dict[str, Any]] = []
-    
+    addr = wallet.lower()
     for hit, (key, weight_applied) in zip(hits, applied):
-        rows.append({
-            "wallet": wallet.lower(),
+        risk_event_queue.put({
+            "wallet": addr,
             "feature": key,
             "details": hit.details or {},
             "weight_applied": weight_applied,
             "timestamp": hit.occurred_at.isoformat()
         })
-    
-    if rows:
-        try:
-            sb.table("risk_events").insert(rows).execute()
-        except Exception as e:
-            print(f"Warning: Failed to log risk events: {e}")
 
 
 def upsert_risk_score(wallet: str, score: int, band: str, 
-                     reasons: List[str] = None, confidence: float = 0.8) -> None:
+                      reasons: List[str] = None, confidence: float = 0.8) -> None:
     """Update risk score in database with enhanced metadata"""
-    sb = get_supabase()
-    try:
-        data = {
-            "wallet": wallet.lower(),
-            "score": score,
-            "band": band
-        }
-        sb.table("risk_scores").upsert(data).execute()
-    except Exception as e:
-        print(f"Warning: Failed to upsert risk score: {e}")
+    factors = list(reasons or [])
+    data = {
+        "wallet": wallet.lower(),
+        "score": score,
+        "band": band,
+        "risk_factors": factors
+    }
+    # Update the read cache right away so lookups don't wait for the flush
+    _risk_cache[data["wallet"]] = (score, band, factors)
+    risk_score_queue.put(data)
+
+
+async def get_cached_risk(wallet: str) -> Optional[Tuple[int, str, List[str]]]:
+    """Return the stored (score, band, risk_factors) snapshot for a wallet, if any.
+
+    Results, including misses, are cached for 30s; upsert_risk_score keeps the cache coherent.
+    """
+    addr = (wallet or "").lower()
+    cached = _risk_cache.get(addr, _NOT_CACHED)
+    if cached is not _NOT_CACHED:
+        return cached
+    rows = await query("risk_scores", "score,band,risk_factors", {"wallet": addr}, limit=1)
+    if rows:
+        data = rows[0]
+        snapshot = (int(round(data.get("score") or 0)), data.get("band") or "LOW", data.get("risk_factors") or [])
+    else:
+        snapshot = None
+    _risk_cache[addr] = snapshot
+    return snapshot
 
 
-def get_risk_profile(wallet: str) -> Optional[RiskProfile]:
+async def get_risk_profile(wallet: str) -> Optional[RiskProfile]:
     """Retrieve comprehensive risk profile from database"""
-    sb = get_supabase()
     try:
         # Get risk score
-        score_res = sb.table("risk_scores").select("*").eq("wallet", wallet.lower()).limit(1).execute()
-        score_data = score_res.data[0] if score_res.data else None
+        score_rows = await query("risk_scores", "*", {"wallet": wallet.lower()}, limit=1)
+        score_data = score_rows[0] if score_rows else None
         
         if not score_data:
             return None
         
         # Get recent risk events
-        events_res = sb.table("risk_events").select("*").eq("wallet", wallet.lower()).order("timestamp", desc=True).limit(50).execute()
-        events = events_res.data or []
+        events = await query("risk_events", "*", {"wallet": wallet.lower()}, order="timestamp.desc", limit=50)
         
         # Get transaction stats (would need additional table)
         # This is a placeholder for future enhancement
@@ -368,7 +398,7 @@ def get_risk_profile(wallet: str) -> Optional[RiskProfile]:
             wallet=wallet.lower(),
             risk_score=score_data.get("score", 0),
             risk_band=score_data.get("band", "LOW"),
-            risk_factors=[],  # Not stored in current schema
+            risk_factors=score_data.get("risk_factors") or [],
             confidence=0.8,  # Default confidence
             last_updated=datetime.now(timezone.utc),  # Use current time
             transaction_count=0,  # Placeholder
@@ -376,5 +406,5 @@ def get_risk_profile(wallet: str) -> Optional[RiskProfile]:
             suspicious_patterns=[]  # Placeholder
         )
     except Exception as e:
-        print(f"Warning: Failed to get risk profile: {e}")
+        logger.warning("Failed to get risk profile: %s", e)
         return None
@@ -1,26 +1,78 @@
 from __future__ import annotations
 
-from typing import Tuple
+import asyncio
+import logging
+import time
+from typing import FrozenSet, Optional, Tuple
 
-from .supabase_client import get_supabase
+from .supabase_client import query
+
+logger = logging.getLogger(__name__)
 
 
 class SanctionsChecker:
+	"""Sanctions lookups against an in-memory copy of `sanctioned_wallets`.
+
+	The table is small and changes rarely, so it is loaded once (paginated)
+	and refreshed in the background every REFRESH_SECONDS; checks are set
+	membership with no database traffic. Addresses are stored lowercase at
+	ingest (see ingest_sanctions.py and the lowercase CHECK constraint).
+	"""
+
+	REFRESH_SECONDS = 300
+	# After a failed background refresh, wait this long before trying again
+	RETRY_SECONDS = 30
+	PAGE_SIZE = 1000
+
+	def __init__(self) -> None:
+		self._set: FrozenSet[str] = frozenset()
+		self._loaded_at = 0.0
+		self._refresh_task: Optional[asyncio.Task] = None
+		self._load_lock = asyncio.Lock()
+
 	async def load_initial(self) -> None:
-		return None
+		# Concurrent first callers share one load instead of each scanning the table
+		async with self._load_lock:
+			if not self._loaded_at:
+				await self._refresh()
+
+	async def _refresh(self) -> None:
+		addresses = set()
+		offset = 0
+		while True:
+			rows = await query(
+				"sanctioned_wallets", "address", order="address", limit=self.PAGE_SIZE, offset=offset,
+			)
+			addresses.update((row.get("address") or "").lower() for row in rows)
+			if len(rows) < self.PAGE_SIZE:
+				break
+			offset += self.PAGE_SIZE
+		addresses.discard("")
+		self._set = frozenset(addresses)
+		self._loaded_at = time.monotonic()
+
+	async def _refresh_in_background(self) -> None:
+		try:
+			await self._refresh()
+		except Exception as e:
+			logger.warning("Failed to refresh sanctioned wallets: %s", e)
+			# Keep serving the current snapshot and retry in RETRY_SECONDS, not on every call
+			self._loaded_at = time.monotonic() - self.REFRESH_SECONDS + self.RETRY_SECONDS
 
 	async def is_sanctioned(self, address: str) -> bool:
 		addr = (address or "").lower()
-		sb = get_supabase()
-		res = sb.table("sanctioned_wallets").select("address").eq("address", addr).limit(1).execute()
-		rows = res.data or []
-		return bool(rows)
+		if not self._loaded_at:
+			await self.load_initial()
+		elif time.monotonic() - self._loaded_at > self.REFRESH_SECONDS and (
+			self._refresh_task is None or self._refresh_task.done()
+		):
+			# Serve the current snapshot while a fresh copy loads
+			self._refresh_task = asyncio.create_task(self._refresh_in_background())
+		return addr in self._set
 
 	async def get_risk(self, address: str) -> Tuple[int, str]:
 		addr = (address or "").lower()
-		sb = get_supabase()
-		res = sb.table("risk_scores").select("score,band").eq("wallet", addr).limit(1).execute()
-		rows = res.data or []
+		rows = await query("risk_scores", "score,band", {"wallet": addr}, limit=1)
 		if not rows:
 			return 0, "LOW"
 		data = rows[0]
@@ -1,7 +1,21 @@
 import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
 from supabase import create_client, Client
 
+try:
+	import h2  # noqa: F401  (enables httpx HTTP/2)
+	_HTTP2 = True
+except ImportError:  # optional; falls back to HTTP/1.1 keepalive
+	_HTTP2 = False
+
 _client: Client | None = None
+_rest: httpx.AsyncClient | None = None
+
+# Keepalive pool shared by every coroutine talking to PostgREST
+_REST_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0)
+_REST_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
 
 
 def get_supabase() -> Client:
@@ -13,3 +27,100 @@ def get_supabase() -> Client:
 			raise RuntimeError("Missing Supabase configuration")
 		_client = create_client(url, key)
 	return _client
+
+
+def get_rest_client() -> httpx.AsyncClient:
+	"""Shared async PostgREST client for request handlers.
+
+	startup_event builds it up front; the helpers below read `_rest` directly
+	and only fall back to this call while it is still unset.
+
+	Unlike the supabase-py client this never blocks the event loop, and
+	all callers reuse one pooled set of keepalive connections (multiplexed
+	over HTTP/2 when the h2 package is installed).
+	"""
+	global _rest
+	if _rest is None:
+		url = os.getenv("SUPABASE_URL")
+		key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+		if not url or not key:
+			raise RuntimeError("Missing Supabase configuration")
+		_rest = httpx.AsyncClient(
+			base_url=f"{url.rstrip('/')}/rest/v1",
+			headers={"apikey": key, "Authorization": f"Bearer {key}"},
+			limits=_REST_LIMITS,
+			timeout=_REST_TIMEOUT,
+			http2=_HTTP2,
+		)
+	return _rest
+
+
+async def close_rest_client() -> None:
+	global _rest
+	if _rest is not None:
+		await _rest.aclose()
+		_rest = None
+
+
+def _filter_value(value: Any) -> str:
+	if isinstance(value, bool):
+		return "true" if value else "false"
+	return str(value)
+
+
+def _eq_params(eq: Optional[Dict[str, Any]]) -> Dict[str, str]:
+	return {col: f"eq.{_filter_value(val)}" for col, val in (eq or {}).items()}
+
+
+async def query(table: str, select: str = "*", eq: Optional[Dict[str, Any]] = None,
+                limit: Optional[int] = None, or_: Optional[str] = None,
+                filters: Sequence[Tuple[str, str]] = (), order: Optional[str] = None,
+                offset: Optional[int] = None) -> List[Dict[str, Any]]:
+	"""SELECT `select` FROM `table` WHERE col = value AND ... and return the rows.
+
+	`or_` is a raw PostgREST disjunction such as "(a.eq.1,b.eq.1)"; callers must
+	make sure any values embedded in it are safe. `filters` adds further
+	(column, "op.value") pairs, e.g. ("timestamp", "gte.2024-01-01"), and
+	`order` is a PostgREST ordering such as "timestamp.desc".
+	"""
+	params: List[Tuple[str, str]] = [("select", select), *_eq_params(eq).items(), *filters]
+	if or_:
+		params.append(("or", or_))
+	if order:
+		params.append(("order", order))
+	if limit is not None:
+		params.append(("limit", str(limit)))
+	if offset:
+		params.append(("offset", str(offset)))
+	res = await (_rest or get_rest_client()).get(f"/{table}", params=params)
+	res.raise_for_status()
+	return res.json()
+
+
+async def insert(table: str, rows: Dict[str, Any] | List[Dict[str, Any]],
+                 returning: bool = False) -> List[Dict[str, Any]]:
+	"""INSERT one or many rows. Inserted rows are only returned when `returning` is set."""
+	prefer = "return=representation" if returning else "return=minimal"
+	res = await (_rest or get_rest_client()).post(f"/{table}", json=rows, headers={"Prefer": prefer})
+	res.raise_for_status()
+	return res.json() if returning else []
+
+
+async def update(table: str, values: Dict[str, Any], eq: Dict[str, Any]) -> None:
+	res = await (_rest or get_rest_client()).patch(
+		f"/{table}", params=_eq_params(eq), json=values, headers={"Prefer": "return=minimal"}
+	)
+	res.raise_for_status()
+
+
+async def upsert(table: str, rows: Dict[str, Any] | List[Dict[str, Any]],
+                 on_conflict: Optional[str] = None, ignore_duplicates: bool = False) -> None:
+	"""INSERT ... ON CONFLICT (`on_conflict`, default: primary key) DO UPDATE, or DO NOTHING with `ignore_duplicates`"""
+	resolution = "ignore-duplicates" if ignore_duplicates else "merge-duplicates"
+	res = await (_rest or get_rest_client()).post(
+		f"/{table}",
+		params={"on_conflict": on_conflict} if on_conflict else None,
+		json=rows,
+		headers={"Prefer": f"resolution={resolution},return=minimal"},
+	)
+	res.raise_for_status()
@@ -1,32 +1,59 @@
+from typing import Any, Dict, Optional
+
 import rlp
 
 
-def is_hex_string(value: str) -> bool:
+def decode_hex(value: str) -> Optional[bytes]:
+	"""Decode a hex string (optionally 0x/0X-prefixed) in one C-level pass; None if it isn't one"""
 	if not isinstance(value, str):
-		return False
-	if value.startswith("0x"):
-		value = value[2:]
+		return None
+	body = value[2:] if value[:2] in ("0x", "0X") else value
 	try:
-		int(value, 16)
-		return True
-	except Exception:
-		return False
+		raw = bytes.fromhex(body)
+	except ValueError:
+		return None
+	# bytes.fromhex tolerates whitespace between bytes; require dense hex
+	if len(raw) * 2 != len(body):
+		return None
+	return raw
 
 
-def extract_to_address(raw_tx_hex: str):
-	data = raw_tx_hex[2:] if raw_tx_hex.startswith("0x") else raw_tx_hex
-	raw = bytes.fromhex(data)
-	# Typed tx if first byte in {1,2}
-	if len(raw) == 0:
+def _int(value: bytes) -> int:
+	return int.from_bytes(value, "big")
+
+
+def decode_tx_fields(raw: bytes) -> Optional[Dict[str, Any]]:
+	"""RLP-decode a signed raw tx once into the fields the relay reports on.
+
+	Returns {"type", "to", "value", "data", "gas", "gasPrice"} (gasPrice is
+	maxFeePerGas for EIP-1559), or None if the bytes are not a legacy,
+	EIP-2930 or EIP-1559 transaction.
+	"""
+	if not raw:
 		return None
-	if raw[0] in (1, 2):
-		fields = rlp.decode(raw[1:])
-		# EIP-2930/1559: [chainId, nonce, maxPriorityFeePerGas, maxFeePerGas, gas, to, value, data, accessList, ...]
-		to_bytes = fields[5] if len(fields) > 5 else b""
-	else:
-		# Legacy: [nonce, gasPrice, gas, to, value, data, v, r, s]
-		fields = rlp.decode(raw)
-		to_bytes = fields[3] if len(fields) > 3 else b""
-	if not to_bytes:
+	tx_type = raw[0]
+	try:
+		if tx_type == 2:
+			# [chainId, nonce, maxPriorityFeePerGas, maxFeePerGas, gas, to, value, data, accessList, y, r, s]
+			fields = rlp.decode(raw[1:])
+			gas_price, gas, to, value, data = fields[3:8]
+		elif tx_type == 1:
+			# [chainId, nonce, gasPrice, gas, to, value, data, accessList, y, r, s]
+			fields = rlp.decode(raw[1:])
+			gas_price, gas, to, value, data = fields[2:7]
+		elif tx_type >= 0xC0:
+			# Legacy: [nonce, gasPrice, gas, to, value, data, v, r, s]
+			fields = rlp.decode(raw)
+			gas_price, gas, to, value, data = fields[1:6]
+		else:
+			return None
+		return {
+			"type": tx_type if tx_type < 0xC0 else 0,
+			"to": "0x" + to.hex() if to else None,
+			"value": _int(value),
+			"data": bytes(data),
+			"gas": _int(gas),
+			"gasPrice": _int(gas_price),
+		}
+	except Exception:
 		return None
-	return "0x" + to_bytes.hex()
@@ -1,6 +1,18 @@
+import re
 from datetime import datetime, timezone
+from functools import lru_cache
 from pydantic import BaseModel
 
+try:
+	import ciso8601
+except ImportError:  # optional C parser; stdlib fallback below
+	ciso8601 = None
+
+_UTC = timezone.utc
+
+# 0x-prefixed 20-byte EVM address; use with fullmatch
+EVM_ADDR_RE = re.compile(r"0x[0-9a-fA-F]{40}")
+
 class Decision(BaseModel):
 	allowed: bool
 	risk_band: str
@@ -18,3 +30,20 @@ def decision_from(sanctioned: bool, score: int, band: str) -> Decision:
 
 def now_iso() -> str:
 	return datetime.now(timezone.utc).isoformat()
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_utc(value: str) -> datetime:
+	"""Parse an ISO 8601 timestamp into an aware UTC datetime (naive input is taken as UTC)
+
+	Memoized: feature batches commonly repeat the same timestamps, and datetimes are immutable.
+	"""
+	if ciso8601 is not None:
+		dt = ciso8601.parse_datetime(value)
+	else:
+		dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+	if dt.tzinfo is None:
+		return dt.replace(tzinfo=_UTC)
+	if dt.utcoffset():
+		return dt.astimezone(_UTC)
+	return dt
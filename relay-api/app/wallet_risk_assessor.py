@@ -17,6 +17,12 @@ except Exception:
     def get_secret(name: str, env_var: Optional[str] = None) -> Optional[str]:
         return os.getenv(env_var or name)
 
+try:
+    from .utils import EVM_ADDR_RE
+except ImportError:
+    # Imported as a top-level module (app/ on sys.path)
+    from utils import EVM_ADDR_RE
+
 @dataclass
 class WalletRiskProfile:
     address: str
@@ -515,12 +521,4 @@ class WalletRiskAssessor:
         return chain_map.get(chain.lower())
     
     def is_valid_address(self, address: str) -> bool:
-        if not address or not isinstance(address, str):
-            return False
-        if not address.startswith("0x") or len(address) != 42:
-            return False
-        try:
-            int(address[2:], 16)
-            return True
-        except ValueError:
-            return False
+        return isinstance(address, str) and EVM_ADDR_RE.fullmatch(address) is not None
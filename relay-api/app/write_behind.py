@@ -0,0 +1,134 @@
+"""
+Write-behind queue that batches best-effort Supabase writes off the request path
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from .supabase_client import insert, upsert
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+# Drops only happen under overload; warn on the first and then every DROP_LOG_EVERY-th
+DROP_LOG_EVERY = 1000
+
+# Queued by stop(): the worker flushes what it holds and exits instead of being cancelled mid-write
+_STOP = object()
+
+
+class WriteBehindQueue:
+	"""Buffers rows for one table and flushes them in batches from a background worker.
+
+	Handlers call put() and return immediately; the worker collects up to
+	`batch_size` rows (or whatever arrived within `flush_interval` seconds)
+	and writes them with a single request. Rows are dropped, and counted, when
+	the queue is full.
+
+	With `on_conflict` rows are upserted on those columns: the latest row wins,
+	or the first one when `ignore_duplicates` is set (existing rows are kept).
+	"""
+
+	def __init__(self, table: str, maxsize: int = 10_000, batch_size: int = 100,
+	             flush_interval: float = 0.05, on_conflict: Optional[str] = None,
+	             ignore_duplicates: bool = False):
+		self.table = table
+		self.batch_size = batch_size
+		self.flush_interval = flush_interval
+		self.on_conflict = on_conflict
+		self.ignore_duplicates = ignore_duplicates
+		# Columns of the unique key named by on_conflict, e.g. "partner_id,idempotency_key"
+		self._conflict_cols = tuple(c.strip() for c in on_conflict.split(",")) if on_conflict else ()
+		self.dropped = 0
+		self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=maxsize)
+		self._worker: Optional[asyncio.Task] = None
+
+	def put(self, row: Row) -> bool:
+		try:
+			self._queue.put_nowait(row)
+			return True
+		except asyncio.QueueFull:
+			self.dropped += 1
+			if self.dropped == 1 or self.dropped % DROP_LOG_EVERY == 0:
+				logger.warning("%s write queue full, %d rows dropped so far", self.table, self.dropped)
+			return False
+
+	def start(self) -> None:
+		if self._worker is None or self._worker.done():
+			self._worker = asyncio.create_task(self._run())
+
+	async def stop(self) -> None:
+		"""Stop the worker once its current write finishes, then flush whatever is still queued"""
+		if self._worker is not None:
+			if not self._worker.done():
+				# Waits for room if the queue is full; the worker is draining it meanwhile
+				await self._queue.put(_STOP)
+				await self._worker
+			self._worker = None
+		pending: List[Row] = []
+		while not self._queue.empty():
+			pending.append(self._queue.get_nowait())
+		for i in range(0, len(pending), self.batch_size):
+			await self._flush(pending[i:i + self.batch_size])
+
+	async def _run(self) -> None:
+		loop = asyncio.get_running_loop()
+		stopping = False
+		while not stopping:
+			row = await self._queue.get()
+			if row is _STOP:
+				return
+			batch = [row]
+			deadline = loop.time() + self.flush_interval
+			while len(batch) < self.batch_size:
+				timeout = deadline - loop.time()
+				if timeout <= 0:
+					break
+				try:
+					row = await asyncio.wait_for(self._queue.get(), timeout)
+				except asyncio.TimeoutError:
+					break
+				if row is _STOP:
+					stopping = True
+					break
+				batch.append(row)
+			await self._flush(batch)
+
+	async def _flush(self, batch: List[Row]) -> None:
+		if not batch:
+			return
+		try:
+			if self.on_conflict:
+				await upsert(self.table, self._dedupe(batch), on_conflict=self.on_conflict,
+				             ignore_duplicates=self.ignore_duplicates)
+			else:
+				await insert(self.table, batch)
+		except Exception as e:
+			logger.warning("Failed to write %d rows to %s: %s", len(batch), self.table, e)
+
+	def _dedupe(self, batch: List[Row]) -> List[Row]:
+		# Postgres rejects an upsert that touches the same conflict key twice; keep the latest
+		# row, or the first one when duplicates are ignored
+		latest: Dict[Any, Row] = {}
+		unkeyed: List[Row] = []
+		for row in batch:
+			key = tuple(row.get(col) for col in self._conflict_cols)
+			if None in key:
+				# NULLs never conflict in a unique index
+				unkeyed.append(row)
+			elif not (self.ignore_duplicates and key in latest):
+				latest[key] = row
+		return unkeyed + list(latest.values())
+
+
+# Rows in one queue must share the same columns so they can be bulk-inserted together.
+# relay_logs: the first outcome for an idempotency key wins (a retry that fails with
+# "already known" must not erase it), except that a broadcast tx_hash always lands.
+relay_log_queue = WriteBehindQueue("relay_logs", on_conflict="partner_id,idempotency_key", ignore_duplicates=True)
+relay_tx_log_queue = WriteBehindQueue("relay_logs", on_conflict="partner_id,idempotency_key")
+risk_event_queue = WriteBehindQueue("risk_events")
+risk_score_queue = WriteBehindQueue("risk_scores", on_conflict="wallet")
+
+ALL_QUEUES = (relay_log_queue, relay_tx_log_queue, risk_event_queue, risk_score_queue)
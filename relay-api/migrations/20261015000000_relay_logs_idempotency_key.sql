@@ -0,0 +1,19 @@
+-- One relay_logs row per (partner, idempotency key) so client retries upsert instead of
+-- duplicating. Keys are chosen by clients, so they are only unique within a partner.
+-- NULL keys stay distinct, so requests without a key are unaffected.
+--
+-- Apply before deploying the relay-api version that upserts relay_logs: without this index
+-- every batched relay_logs write (including /v1/check rows) fails with "no unique or
+-- exclusion constraint matching the ON CONFLICT specification" and is only logged as a warning.
+
+-- Drop duplicates left by earlier retries, preferring a row with a tx_hash, then the newest copy.
+DELETE FROM public.relay_logs a
+  USING public.relay_logs b
+  WHERE a.ctid <> b.ctid
+    AND a.partner_id = b.partner_id
+    AND a.idempotency_key = b.idempotency_key
+    AND ((a.tx_hash IS NULL AND b.tx_hash IS NOT NULL)
+         OR ((a.tx_hash IS NULL) = (b.tx_hash IS NULL) AND a.ctid < b.ctid));
+
+CREATE UNIQUE INDEX IF NOT EXISTS relay_logs_partner_idempotency_key_key
+  ON public.relay_logs (partner_id, idempotency_key);
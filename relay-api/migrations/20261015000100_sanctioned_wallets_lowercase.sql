@@ -0,0 +1,18 @@
+-- Sanctioned addresses are matched on their lowercase form with plain equality, which the
+-- existing unique index on address already serves. Enforce that form at write time so no
+-- lower(address) scan (or expression index) is ever needed.
+
+-- Drop case-only duplicates, preferring an existing lowercase row, then the oldest copy.
+DELETE FROM public.sanctioned_wallets a
+  USING public.sanctioned_wallets b
+  WHERE a.ctid <> b.ctid
+    AND lower(a.address) = lower(b.address)
+    AND (b.address = lower(b.address)
+         OR (a.address <> lower(a.address) AND a.ctid > b.ctid));
+
+UPDATE public.sanctioned_wallets
+  SET address = lower(address)
+  WHERE address <> lower(address);
+
+ALTER TABLE public.sanctioned_wallets
+  ADD CONSTRAINT sanctioned_wallets_address_lowercase CHECK (address = lower(address));
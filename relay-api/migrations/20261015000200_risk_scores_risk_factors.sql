@@ -0,0 +1,4 @@
+-- upsert_risk_score persists the reasons behind each score so the cached-score fallback
+-- in make_decision_with_risk can return them without recomputing.
+ALTER TABLE public.risk_scores
+  ADD COLUMN IF NOT EXISTS risk_factors jsonb NOT NULL DEFAULT '[]'::jsonb;
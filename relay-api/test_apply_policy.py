@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script: the table-driven _apply_policy matches the original if/elif policy
+"""
+
+import sys
+from pathlib import Path
+
+# Import through the app package (app/secrets.py would shadow the stdlib module on sys.path)
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.main import _apply_policy
+
+BANDS = ("LOW", "MEDIUM", "HIGH", "CRITICAL", "PROHIBITED", "")
+
+
+def reference_policy(sanctioned: bool, score: int, band: str):
+    """The original cascade the _POLICY table replaced"""
+    if sanctioned or band == "PROHIBITED" or score >= 100:
+        return False, "blocked", False
+    if score == 50:
+        return True, "alert", True
+    if score == 0:
+        return True, None, False
+    if band in {"HIGH", "CRITICAL"} or score >= 80:
+        return False, "blocked", False
+    return True, None, False
+
+
+def test_policy_matches_reference():
+    """Exhaustive over scores -5..129, every band, sanctioned or not"""
+    print("🔍 Testing _apply_policy against the reference policy...")
+    
+    mismatches = [
+        (sanctioned, score, band)
+        for sanctioned in (False, True)
+        for score in range(-5, 130)
+        for band in BANDS
+        if _apply_policy(sanctioned, score, band) != reference_policy(sanctioned, score, band)
+    ]
+    assert not mismatches, mismatches[:10]
+    print(f"  ✅ {2 * 135 * len(BANDS)} combinations match")
+
+
+if __name__ == "__main__":
+    print("🚀 Policy Table Test")
+    print("=" * 50)
+    
+    try:
+        test_policy_matches_reference()
+        print("\n" + "=" * 50)
+        print("✨ All tests completed successfully!")
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test script for the write-behind queue and the in-process TTL cache
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Import through the app package (app/secrets.py would shadow the stdlib module on sys.path)
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import write_behind
+from app.cache import TTLCache
+from app.write_behind import WriteBehindQueue
+
+
+class FakeWriter:
+    """Stands in for supabase_client.insert/upsert and records every request"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def insert(self, table, rows):
+        await asyncio.sleep(self.delay)
+        self.calls.append(("insert", table, list(rows), None, False))
+
+    async def upsert(self, table, rows, on_conflict=None, ignore_duplicates=False):
+        await asyncio.sleep(self.delay)
+        self.calls.append(("upsert", table, list(rows), on_conflict, ignore_duplicates))
+
+    @property
+    def rows(self):
+        return [row for call in self.calls for row in call[2]]
+
+
+def _run_with_writer(writer: FakeWriter, scenario):
+    original = write_behind.insert, write_behind.upsert
+    write_behind.insert, write_behind.upsert = writer.insert, writer.upsert
+    try:
+        return asyncio.run(scenario())
+    finally:
+        write_behind.insert, write_behind.upsert = original
+
+
+def test_batches_by_size_and_interval():
+    writer = FakeWriter()
+    
+    async def scenario():
+        q = WriteBehindQueue("risk_events", batch_size=3, flush_interval=0.05)
+        q.start()
+        for i in range(7):
+            q.put({"i": i})
+        await asyncio.sleep(0.2)
+        await q.stop()
+    
+    _run_with_writer(writer, scenario)
+    assert [len(call[2]) for call in writer.calls] == [3, 3, 1], writer.calls
+    assert [row["i"] for row in writer.rows] == list(range(7))
+    print("  ✅ rows flushed in batches of batch_size, remainder after flush_interval")
+
+
+def test_stop_finishes_inflight_flush():
+    writer = FakeWriter(delay=0.2)
+    
+    async def scenario():
+        q = WriteBehindQueue("relay_logs", batch_size=2, flush_interval=0.01)
+        q.start()
+        for i in range(5):
+            q.put({"i": i})
+        await asyncio.sleep(0.05)  # worker is now inside a slow write
+        await q.stop()
+        return q
+    
+    q = _run_with_writer(writer, scenario)
+    assert sorted(row["i"] for row in writer.rows) == list(range(5)), writer.calls
+    assert q._worker is None
+    print("  ✅ stop() lets the in-flight write finish and flushes the rest")
+
+
+def test_dedupe_on_conflict_columns():
+    merge = WriteBehindQueue("relay_logs", on_conflict="partner_id,idempotency_key")
+    keep_first = WriteBehindQueue("relay_logs", on_conflict="partner_id,idempotency_key", ignore_duplicates=True)
+    batch = [
+        {"partner_id": "a", "idempotency_key": "k1", "n": 1},
+        {"partner_id": "b", "idempotency_key": "k1", "n": 2},  # other partner: not a duplicate
+        {"partner_id": "a", "idempotency_key": "k1", "n": 3},
+        {"partner_id": "a", "idempotency_key": None, "n": 4},  # NULLs never conflict
+        {"partner_id": "a", "idempotency_key": None, "n": 5},
+    ]
+    assert sorted(row["n"] for row in merge._dedupe(batch)) == [2, 3, 4, 5]
+    assert sorted(row["n"] for row in keep_first._dedupe(batch)) == [1, 2, 4, 5]
+    print("  ✅ batches deduped on every conflict column (latest or first row wins)")
+
+
+def test_upsert_flags_passed_through():
+    writer = FakeWriter()
+    
+    async def scenario():
+        q = WriteBehindQueue("relay_logs", on_conflict="partner_id,idempotency_key", ignore_duplicates=True)
+        q.put({"partner_id": "a", "idempotency_key": "k"})
+        await q.stop()  # never started: stop() still flushes what is queued
+    
+    _run_with_writer(writer, scenario)
+    assert writer.calls == [("upsert", "relay_logs", [{"partner_id": "a", "idempotency_key": "k"}],
+                             "partner_id,idempotency_key", True)], writer.calls
+    print("  ✅ on_conflict / ignore_duplicates reach the upsert")
+
+
+def test_drop_counter():
+    async def scenario():
+        q = WriteBehindQueue("risk_events", maxsize=2)
+        results = [q.put({"i": i}) for i in range(5)]
+        return q, results
+    
+    q, results = asyncio.run(scenario())
+    assert results == [True, True, False, False, False]
+    assert q.dropped == 3
+    print("  ✅ full queue drops rows and counts them")
+
+
+def test_ttl_cache():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, timer=lambda: now[0])
+    
+    cache["none"] = None
+    cache["false"] = False
+    assert "none" in cache and cache.get("none", "miss") is None
+    assert cache.get("false", "miss") is False
+    
+    # LRU: reading "none" makes "false" the eviction candidate
+    cache.get("none")
+    cache["new"] = 1
+    assert "false" not in cache and "none" in cache and "new" in cache
+    assert len(cache) == 2
+    
+    # Expiry
+    now[0] = 10.0
+    assert cache.get("new", "miss") == "miss"
+    assert "none" not in cache
+    print("  ✅ TTLCache expiry, LRU eviction and cached None/False values")
+
+
+if __name__ == "__main__":
+    print("🚀 Write-Behind Queue Test")
+    print("=" * 50)
+    
+    try:
+        test_batches_by_size_and_interval()
+        test_stop_finishes_inflight_flush()
+        test_dedupe_on_conflict_columns()
+        test_upsert_flags_passed_through()
+        test_drop_counter()
+        test_ttl_cache()
+        print("\n" + "=" * 50)
+        print("✨ All tests completed successfully!")
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()